@@ -0,0 +1 @@
+"""Offline benchmarks for the Zaparoo integration hot paths."""
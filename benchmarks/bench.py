@@ -0,0 +1,278 @@
+"""
+Latency and throughput benchmarks for the Zaparoo integration.
+
+Measures the hot paths against a FakeZaparooCore on localhost:
+
+- decode: ZaparooWebSocket._handle_message through the coordinator to the
+  entity listeners, per frame, plus allocations per event
+- event: notification sent by the device to entity listener called
+- rpc: send_jsonrpc round-trips under concurrency
+
+Results can be saved and compared against a baseline to gate regressions:
+
+    python -m benchmarks.bench --save baseline.json
+    python -m benchmarks.bench --baseline baseline.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.zaparoo.const import (
+    SLICE_CONNECTION,
+    SLICE_EVENT,
+    SLICE_MEDIA,
+)
+from custom_components.zaparoo.coordinator import ZaparooCoordinator
+from custom_components.zaparoo.websocket_client import ZaparooWebSocket
+
+from .fake_core import FakeZaparooCore, token_storm
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Slices subscribed to by the entities the integration creates per device.
+ENTITY_SLICES = (
+    frozenset({SLICE_EVENT}),  # notification sensor
+    frozenset({SLICE_CONNECTION}),  # connected sensor
+    frozenset({SLICE_MEDIA}),  # media sensor
+    frozenset({SLICE_EVENT}),  # event entity
+)
+
+# Metrics ending in this suffix are better when higher; all others when lower.
+HIGHER_IS_BETTER = "_per_s"
+
+
+def _percentiles(samples_ns: list[int], prefix: str) -> dict[str, float]:
+    """Return p50/p90/p99 in microseconds."""
+    cuts = statistics.quantiles(samples_ns, n=100, method="inclusive")
+    return {
+        f"{prefix}_p50_us": cuts[49] / 1000,
+        f"{prefix}_p90_us": cuts[89] / 1000,
+        f"{prefix}_p99_us": cuts[98] / 1000,
+    }
+
+
+def _add_entity_listeners(
+    coordinator: ZaparooCoordinator, on_update: Callable[[], None] | None = None
+) -> None:
+    """Register one listener per entity, reading state the way entities do."""
+    for context in ENTITY_SLICES:
+
+        def _listener(context: frozenset[str] = context) -> None:
+            for key in context:
+                getattr(coordinator.data, key, None)
+            if on_update is not None:
+                on_update()
+
+        coordinator.async_add_listener(_listener, context)
+
+
+def _frames(count: int) -> list[str]:
+    return [
+        json.dumps({"jsonrpc": "2.0", "method": method, "params": params})
+        for _, method, params in token_storm(count // 2)
+    ]
+
+
+async def bench_decode(hass: HomeAssistant, count: int) -> dict[str, float]:
+    """Frame in, through _handle_message and the coordinator, to listeners."""
+    coordinator = ZaparooCoordinator(hass)
+    client = ZaparooWebSocket("127.0.0.1", 0, coordinator)
+    _add_entity_listeners(coordinator)
+    frames = _frames(count)
+
+    samples: list[int] = []
+    start = time.perf_counter_ns()
+    for frame in frames:
+        t0 = time.perf_counter_ns()
+        client._handle_message(frame)  # noqa: SLF001
+        samples.append(time.perf_counter_ns() - t0)
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+
+    # Allocation profile on a second pass over fresh state.
+    coordinator = ZaparooCoordinator(hass)
+    client = ZaparooWebSocket("127.0.0.1", 0, coordinator)
+    _add_entity_listeners(coordinator)
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for frame in frames:
+        client._handle_message(frame)  # noqa: SLF001
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+
+    return {
+        "decode_events_per_s": len(frames) / elapsed,
+        **_percentiles(samples, "decode"),
+        "decode_retained_blocks_per_event": retained_blocks / len(frames),
+        "decode_peak_bytes_per_event": peak / len(frames),
+    }
+
+
+async def bench_event_latency(
+    hass: HomeAssistant, core: FakeZaparooCore, count: int
+) -> dict[str, float]:
+    """
+    Notification sent by the device to the entity listeners being called.
+
+    Events are sent one at a time so each sample is the latency of a single
+    event rather than its time spent queued behind the previous ones.
+    """
+    coordinator = ZaparooCoordinator(hass)
+    client = ZaparooWebSocket(core.host, core.port, coordinator)
+
+    samples: list[int] = []
+    received = asyncio.Event()
+    connected = asyncio.Event()
+
+    def _on_event() -> None:
+        params = coordinator.data.last_event_attributes or {}
+        if (sent := params.get("sent_ns")) is not None:
+            samples.append(time.perf_counter_ns() - sent)
+            received.set()
+
+    coordinator.async_add_listener(_on_event, frozenset({SLICE_EVENT}))
+    coordinator.async_add_listener(connected.set, frozenset({SLICE_CONNECTION}))
+    _add_entity_listeners(coordinator)
+
+    await client.start()
+    try:
+        async with asyncio.timeout(30):
+            await connected.wait()
+            for i in range(count):
+                received.clear()
+                await core.notify(
+                    "tokens.added",
+                    {
+                        "type": "nfc",
+                        "uid": f"{i:08x}",
+                        "sent_ns": time.perf_counter_ns(),
+                    },
+                )
+                await received.wait()
+    finally:
+        await client.stop()
+
+    return _percentiles(samples, "event")
+
+
+async def bench_rpc(
+    hass: HomeAssistant, core: FakeZaparooCore, count: int, concurrency: int
+) -> dict[str, float]:
+    """send_jsonrpc round-trips with a fixed number of concurrent callers."""
+    coordinator = ZaparooCoordinator(hass)
+    client = ZaparooWebSocket(core.host, core.port, coordinator)
+    samples: list[int] = []
+    remaining = count
+    connected = asyncio.Event()
+    coordinator.async_add_listener(connected.set, frozenset({SLICE_CONNECTION}))
+
+    async def _worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            t0 = time.perf_counter_ns()
+            await client.send_jsonrpc("media")
+            samples.append(time.perf_counter_ns() - t0)
+
+    await client.start()
+    try:
+        async with asyncio.timeout(30):
+            await connected.wait()
+        start = time.perf_counter_ns()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+    finally:
+        await client.stop()
+
+    return {
+        "rpc_calls_per_s": len(samples) / elapsed,
+        **_percentiles(samples, "rpc"),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, float]:
+    """Run every benchmark and return the combined metrics."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        core = FakeZaparooCore()
+        await core.start()
+        try:
+            results = await bench_decode(hass, args.events)
+            results |= await bench_event_latency(hass, core, args.events)
+            results |= await bench_rpc(hass, core, args.rpcs, args.concurrency)
+        finally:
+            await core.stop()
+            await hass.async_stop(force=True)
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], max_regression: float
+) -> list[str]:
+    """Return a description of every metric worse than baseline by the margin."""
+    regressions = []
+    for name, base in baseline.items():
+        if name not in results or not base:
+            continue
+        change = (results[name] - base) / base
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > max_regression:
+            regressions.append(
+                f"{name}: {results[name]:.2f} vs baseline {base:.2f} "
+                f"({change:+.0%} worse)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Zaparoo integration hot path benchmarks"
+    )
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--rpcs", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--save", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    width = max(map(len, results))
+    for name, value in results.items():
+        sys.stdout.write(f"{name:<{width}}  {value:12.2f}\n")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline: dict[str, Any] = json.loads(args.baseline.read_text())
+        if regressions := compare(results, baseline, args.max_regression):
+            sys.stdout.write("\nRegressions:\n")
+            sys.stdout.writelines(f"  {line}\n" for line in regressions)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
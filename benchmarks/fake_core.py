@@ -0,0 +1,314 @@
+"""
+Local stand-in for a Zaparoo Core device.
+
+Speaks the /api/v0.1 JSON-RPC dialect closely enough for the integration:
+answers run/stop/media/media.search/systems/tokens/readers/playtime, pushes the
+matching notifications, and can replay scripted event storms. Run it directly
+to point a development Home Assistant instance at it:
+
+    python -m benchmarks.fake_core --port 7497
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any
+
+import websockets
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+API_PATH = "/api/v0.1"
+
+METHOD_NOT_FOUND = -32601
+
+# (delay before sending in seconds, method, params)
+type ScriptStep = tuple[float, str, dict[str, Any] | None]
+
+
+class FakeZaparooCore:
+    """
+    In-process fake Zaparoo Core WebSocket server.
+
+    Each request is answered in its own task after response_delay seconds,
+    plus up to response_jitter more at random, so a slow device still
+    answers concurrent requests concurrently, and out of order with jitter.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        response_delay: float = 0.0,
+        response_jitter: float = 0.0,
+    ) -> None:
+        """Init the fake device state."""
+        self.host = host
+        self.port = port
+        self.response_delay = response_delay
+        self.response_jitter = response_jitter
+
+        self.media: dict[str, Any] | None = None
+        self.last_token: dict[str, Any] | None = None
+        self.readers: dict[str, dict[str, Any]] = {}
+        self.database: dict[str, Any] = {
+            "exists": True,
+            "indexing": False,
+            "totalFiles": 0,
+        }
+        self.library: list[dict[str, Any]] = []
+        self.playtime: dict[str, Any] = {"state": "reset", "sessionActive": False}
+        self.request_counts: dict[str, int] = {}
+
+        self._server: Any = None
+        self._clients: set[Any] = set()
+        self._client_connected = asyncio.Event()
+
+    @property
+    def url(self) -> str:
+        """WebSocket URL clients should connect to."""
+        return f"ws://{self.host}:{self.port}{API_PATH}"
+
+    async def start(self) -> None:
+        """Start listening; binds a free port when port is 0."""
+        self._server = await websockets.serve(self._handle_client, self.host, self.port)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        _LOGGER.info("Fake Zaparoo Core listening on %s", self.url)
+
+    async def stop(self) -> None:
+        """Close every client and stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def wait_for_client(self, timeout: float = 10.0) -> None:  # noqa: ASYNC109
+        """Wait until at least one client is connected."""
+        async with asyncio.timeout(timeout):
+            await self._client_connected.wait()
+
+    async def _handle_client(self, ws: Any) -> None:
+        self._clients.add(ws)
+        self._client_connected.set()
+        answering: set[asyncio.Task[None]] = set()
+        try:
+            async for message in ws:
+                task = asyncio.create_task(self._answer(ws, json.loads(message)))
+                answering.add(task)
+                task.add_done_callback(answering.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in answering:
+                task.cancel()
+            self._clients.discard(ws)
+            if not self._clients:
+                self._client_connected.clear()
+
+    async def _answer(self, ws: Any, request: dict[str, Any]) -> None:
+        delay = self.response_delay
+        if self.response_jitter:
+            delay += random.uniform(0, self.response_jitter)  # noqa: S311
+        if delay:
+            await asyncio.sleep(delay)
+        with contextlib.suppress(websockets.ConnectionClosed):
+            await ws.send(json.dumps(self._respond(request)))
+
+    def _respond(self, request: dict[str, Any]) -> dict[str, Any]:
+        method = request.get("method", "")
+        self.request_counts[method] = self.request_counts.get(method, 0) + 1
+        response: dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+
+        handler = getattr(self, f"_rpc_{method.replace('.', '_')}", None)
+        if handler is None:
+            response["error"] = {
+                "code": METHOD_NOT_FOUND,
+                "message": f"unknown method: {method}",
+            }
+        else:
+            response["result"] = handler(request.get("params") or {})
+        return response
+
+    def _rpc_run(self, params: dict[str, Any]) -> None:
+        text = params.get("text") or ""
+        self.last_token = {
+            "type": params.get("type", ""),
+            "uid": "",
+            "text": text,
+            "data": params.get("data", ""),
+            "scanTime": _now(),
+        }
+        self._queue_notify("tokens.added", self.last_token)
+
+        system, _, name = text.removeprefix("**launch.title:").partition("/")
+        if name:
+            self.media = {
+                "systemId": system,
+                "systemName": system,
+                "mediaPath": f"/media/{system}/{name}",
+                "mediaName": name,
+            }
+            self._queue_notify("media.started", self.media)
+
+    def _rpc_stop(self, _params: dict[str, Any]) -> None:
+        if self.media is not None:
+            self.media = None
+            self._queue_notify("media.stopped", None)
+
+    def _rpc_media(self, _params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "database": self.database,
+            "active": [self.media] if self.media else [],
+        }
+
+    def _rpc_media_search(self, params: dict[str, Any]) -> dict[str, Any]:
+        query = (params.get("query") or "").lower()
+        systems = set(params.get("systems") or ())
+        results = [
+            media
+            for media in self.library
+            if query in media["name"].lower()
+            and (not systems or media["system"]["id"] in systems)
+        ]
+        total = len(results)
+        # The cursor is the offset of the next page.
+        start = int(params.get("cursor") or 0)
+        end = start + (params.get("maxResults") or total)
+        page = results[start:end]
+        has_next = end < total
+        return {
+            "results": page,
+            "total": total,
+            "pagination": {
+                "nextCursor": str(end) if has_next else None,
+                "hasNextPage": has_next,
+                "pageSize": len(page),
+            },
+        }
+
+    def _rpc_systems(self, _params: dict[str, Any]) -> dict[str, Any]:
+        systems = {media["system"]["id"]: media["system"] for media in self.library}
+        return {"systems": list(systems.values())}
+
+    def add_media(self, system_id: str, name: str) -> None:
+        """Add a title to the fake media database."""
+        self.library.append(
+            {
+                "system": {"id": system_id, "name": system_id, "category": "Console"},
+                "name": name,
+                "path": f"/media/{system_id}/{name}",
+            }
+        )
+        self.database["totalFiles"] = len(self.library)
+
+    def _rpc_tokens(self, _params: dict[str, Any]) -> dict[str, Any]:
+        return {"active": [], "last": self.last_token}
+
+    def _rpc_readers(self, _params: dict[str, Any]) -> dict[str, Any]:
+        return {"readers": list(self.readers.values())}
+
+    def _rpc_playtime(self, _params: dict[str, Any]) -> dict[str, Any]:
+        return self.playtime
+
+    def _queue_notify(self, method: str, params: dict[str, Any] | None) -> None:
+        # Notifications follow the response, as they do on a real device.
+        asyncio.get_running_loop().call_soon(
+            lambda: asyncio.ensure_future(self.notify(method, params))
+        )
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Push a notification to every connected client."""
+        payload: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            payload["params"] = params
+        message = json.dumps(payload)
+        for ws in list(self._clients):
+            with contextlib.suppress(websockets.ConnectionClosed):
+                await ws.send(message)
+
+    async def replay(self, script: Iterable[ScriptStep]) -> int:
+        """Send a scripted sequence of notifications; returns how many were sent."""
+        sent = 0
+        for delay, method, params in script:
+            if delay:
+                await asyncio.sleep(delay)
+            await self.notify(method, params)
+            sent += 1
+        return sent
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def indexing_storm(steps: int, interval: float = 0.0) -> Iterator[ScriptStep]:
+    """Yield a full re-index: start, one progress frame per step, finish."""
+    for step in range(steps + 1):
+        params = _indexing(indexing=step < steps, step=step, steps=steps)
+        yield (interval if step else 0.0, "media.indexing", params)
+
+
+def _indexing(*, indexing: bool, step: int, steps: int) -> dict[str, Any]:
+    return {
+        "exists": True,
+        "indexing": indexing,
+        "totalSteps": steps,
+        "currentStep": step,
+        "currentStepDisplay": f"System {step}",
+        "totalFiles": step * 100,
+    }
+
+
+def token_storm(count: int, interval: float = 0.0) -> Iterator[ScriptStep]:
+    """Yield alternating tokens.added/media.started notifications."""
+    for i in range(count):
+        name = f"Game {i}"
+        yield (
+            interval,
+            "tokens.added",
+            {"type": "nfc", "uid": f"{i:08x}", "text": name, "data": ""},
+        )
+        yield (
+            0.0,
+            "media.started",
+            {
+                "systemId": "SNES",
+                "systemName": "Super Nintendo",
+                "mediaPath": f"/media/SNES/{name}.sfc",
+                "mediaName": name,
+            },
+        )
+
+
+async def _serve(host: str, port: int) -> None:
+    core = FakeZaparooCore(host, port)
+    await core.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await core.stop()
+
+
+def main() -> None:
+    """Run the fake device until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7497)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
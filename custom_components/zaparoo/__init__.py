@@ -7,12 +7,25 @@ from typing import TYPE_CHECKING
 from homeassistant.const import Platform
 from homeassistant.loader import async_get_loaded_integration
 
+from custom_components.zaparoo.attributes import AttributePolicy
 from custom_components.zaparoo.coordinator import ZaparooCoordinator
 from custom_components.zaparoo.data import ZaparooData, ZaparooDataConfigEntry
+from custom_components.zaparoo.device_index import async_get_device_index
+from custom_components.zaparoo.library import ZaparooLibrary, async_remove_library
+from custom_components.zaparoo.playtime import PlaytimeLedger, async_remove_playtime
+from custom_components.zaparoo.reconnect import async_get_connect_supervisor
+from custom_components.zaparoo.sequence import LaunchSequencer
 from custom_components.zaparoo.services import async_register_services
+from custom_components.zaparoo.store import ZaparooStateStore, async_remove_store
 from custom_components.zaparoo.websocket_client import ZaparooWebSocket
 
-from .const import DOMAIN
+from .const import (
+    CONF_EVENT_FAMILIES,
+    CONF_INDEXING_WINDOW,
+    DEFAULT_INDEXING_WINDOW,
+    DOMAIN,
+    EVENT_FAMILIES,
+)
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -31,27 +44,83 @@ async def async_setup_entry(hass: HomeAssistant, entry: ZaparooDataConfigEntry)
 
     coordinator = ZaparooCoordinator(
         hass=hass,
+        indexing_window=entry.options.get(
+            CONF_INDEXING_WINDOW, DEFAULT_INDEXING_WINDOW
+        ),
     )
 
+    # Restore the last known device state before any entity is created, so
+    # dashboards render it straight away; the client reconciles on connect.
+    state_store = ZaparooStateStore(hass, entry.entry_id, coordinator)
+    await state_store.async_restore()
+    entry.async_on_unload(state_store.async_start())
+    playtime = PlaytimeLedger(hass, entry.entry_id, coordinator)
+    await playtime.async_load()
+    entry.async_on_unload(playtime.async_start())
+
+    client = ZaparooWebSocket(
+        host=entry.data["host"],
+        port=entry.data["port"],
+        coordinator=coordinator,
+        supervisor=async_get_connect_supervisor(hass),
+    )
+    client.set_event_families(entry.options.get(CONF_EVENT_FAMILIES, EVENT_FAMILIES))
     entry.runtime_data = ZaparooData(
-        client=ZaparooWebSocket(
-            host=entry.data["host"],
-            port=entry.data["port"],
-            coordinator=coordinator,
-        ),
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        state_store=state_store,
+        sequencer=LaunchSequencer(hass, client, coordinator),
+        library=ZaparooLibrary(hass, entry.entry_id, client, coordinator),
+        playtime=playtime,
+        attribute_policy=AttributePolicy.from_options(entry.options),
     )
+    entry.async_on_unload(entry.runtime_data.library.async_start())
     await entry.runtime_data.client.start()
+    entry.async_on_unload(
+        async_get_device_index(hass).async_add_entry(entry.entry_id, entry.runtime_data)
+    )
     # Load the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     async_register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+    entry.async_on_unload(
+        coordinator.async_add_reindexed_listener(entry.runtime_data.search_cache.clear)
+    )
     return True
 
 
+async def _async_update_options(
+    hass: HomeAssistant,  # noqa: ARG001 Required
+    entry: ZaparooDataConfigEntry,
+) -> None:
+    """Apply changed options to the running entry without reloading it."""
+    entry.runtime_data.coordinator.indexing_window = entry.options.get(
+        CONF_INDEXING_WINDOW, DEFAULT_INDEXING_WINDOW
+    )
+    entry.runtime_data.client.set_event_families(
+        entry.options.get(CONF_EVENT_FAMILIES, EVENT_FAMILIES)
+    )
+    # Used from each entity's next state write.
+    entry.runtime_data.attribute_policy = AttributePolicy.from_options(entry.options)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: ZaparooDataConfigEntry
 ) -> bool:
     """Unload a config entry."""
+    entry.runtime_data.sequencer.async_cancel()
     await entry.runtime_data.client.stop()
+    await entry.runtime_data.state_store.async_save()
+    await entry.runtime_data.library.async_save()
+    await entry.runtime_data.playtime.async_save()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: ZaparooDataConfigEntry
+) -> None:
+    """Delete the saved state, library and play time of a removed config entry."""
+    await async_remove_store(hass, entry.entry_id)
+    await async_remove_library(hass, entry.entry_id)
+    await async_remove_playtime(hass, entry.entry_id)
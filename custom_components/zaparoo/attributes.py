@@ -0,0 +1,91 @@
+"""Which device fields entities expose as state attributes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_ATTRIBUTE_MAX_LENGTH,
+    CONF_EXTRA_ATTRIBUTES,
+    DEFAULT_ATTRIBUTE_MAX_LENGTH,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Fields the media and reader sensors keep. Anything else is still available
+# from zaparoo.media, zaparoo.history and the event entity.
+MEDIA_ATTRIBUTES = frozenset(
+    {"systemId", "systemName", "mediaName", "mediaPath", "launcherId", "started"}
+)
+READER_ATTRIBUTES = frozenset({"path", "driver", "connected", "id", "info"})
+
+# Fields that change on nearly every write; shown, but not recorded.
+VOLATILE_ATTRIBUTES = frozenset(
+    {"started", "scanTime", "coalesced", "currentStep", "currentStepDisplay"}
+)
+
+# Results kept by AttributePolicy.apply; enough for every entity of a device.
+MAX_APPLIED = 64
+
+
+@dataclass(frozen=True, slots=True)
+class AttributePolicy:
+    """
+    How a model's attributes are turned into state attributes.
+
+    Models only keep the top-level scalar fields of what the device sent
+    (see models.scalar_attributes), so lists and nested objects never reach
+    the recorder. The policy picks the fields an entity shows and cuts
+    strings to max_length (0 for no limit). Fields in extra_fields are kept
+    on top of an entity's allow-list.
+
+    Models are treated as immutable once decoded, so the result for a
+    model's (or a notification's) attributes is built on the first state
+    write and reused by later writes until the model is replaced. A new
+    policy is built when the options change, which starts over.
+    """
+
+    max_length: int = DEFAULT_ATTRIBUTE_MAX_LENGTH
+    extra_fields: frozenset[str] = frozenset()
+    # (id of the attributes, allowed) -> (attributes, result); the attributes
+    # are held so their id can't be reused while the result is kept.
+    _applied: dict[tuple[int, frozenset[str] | None], tuple[Any, dict[str, Any]]] = (
+        field(default_factory=dict, init=False, repr=False, compare=False)
+    )
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> AttributePolicy:
+        """Build the policy from config entry options."""
+        return cls(
+            max_length=options.get(
+                CONF_ATTRIBUTE_MAX_LENGTH, DEFAULT_ATTRIBUTE_MAX_LENGTH
+            ),
+            extra_fields=frozenset(options.get(CONF_EXTRA_ATTRIBUTES) or ()),
+        )
+
+    def apply(
+        self,
+        attributes: Mapping[str, Any] | None,
+        allowed: frozenset[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return the state attributes for attributes, limited to allowed if given."""
+        if not attributes:
+            return {}
+        source = (id(attributes), allowed)
+        if (applied := self._applied.get(source)) is not None:
+            return applied[1]
+
+        max_length = self.max_length
+        extra = self.extra_fields
+        result = {
+            key: value[:max_length] if max_length and isinstance(value, str) else value
+            for key, value in attributes.items()
+            if allowed is None or key in allowed or key in extra
+        }
+        if len(self._applied) >= MAX_APPLIED:
+            # Older models have been replaced by now; start over.
+            self._applied.clear()
+        self._applied[source] = (attributes, result)
+        return result
@@ -2,8 +2,27 @@
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import CONF_HOST, CONF_PORT, DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_ATTRIBUTE_MAX_LENGTH,
+    CONF_EVENT_FAMILIES,
+    CONF_EXTRA_ATTRIBUTES,
+    CONF_HOST,
+    CONF_INDEXING_WINDOW,
+    CONF_PORT,
+    DEFAULT_ATTRIBUTE_MAX_LENGTH,
+    DEFAULT_INDEXING_WINDOW,
+    DEFAULT_PORT,
+    DOMAIN,
+    EVENT_FAMILIES,
+)
 
 STEP_USER_SCHEMA = vol.Schema(
     {
@@ -18,6 +37,14 @@ class ZaparooConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004 Required
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return ZaparooOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -38,3 +65,45 @@ class ZaparooConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_create_entry(
             title=title, data={CONF_HOST: host, CONF_PORT: port}
         )
+
+
+class ZaparooOptionsFlow(config_entries.OptionsFlow):
+    """Handle Zaparoo options."""
+
+    async def async_step_init(
+        self, user_input: dict | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_INDEXING_WINDOW,
+                    default=options.get(CONF_INDEXING_WINDOW, DEFAULT_INDEXING_WINDOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                vol.Optional(
+                    CONF_ATTRIBUTE_MAX_LENGTH,
+                    default=options.get(
+                        CONF_ATTRIBUTE_MAX_LENGTH, DEFAULT_ATTRIBUTE_MAX_LENGTH
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(
+                    CONF_EXTRA_ATTRIBUTES,
+                    default=options.get(CONF_EXTRA_ATTRIBUTES, []),
+                ): TextSelector(TextSelectorConfig(multiple=True)),
+                vol.Optional(
+                    CONF_EVENT_FAMILIES,
+                    default=options.get(CONF_EVENT_FAMILIES, list(EVENT_FAMILIES)),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=list(EVENT_FAMILIES),
+                        multiple=True,
+                        translation_key=CONF_EVENT_FAMILIES,
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
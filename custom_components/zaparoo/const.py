@@ -4,18 +4,132 @@ DOMAIN = "zaparoo"
 
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_INDEXING_WINDOW = "indexing_window"
+CONF_ATTRIBUTE_MAX_LENGTH = "attribute_max_length"
+CONF_EXTRA_ATTRIBUTES = "extra_attributes"
+CONF_EVENT_FAMILIES = "event_families"
 
 DEFAULT_PORT = 7497
 API_PATH = "/api/v0.1"
+DEFAULT_INDEXING_WINDOW = 1.0
+# Strings in entity attributes are cut to this many characters by default.
+DEFAULT_ATTRIBUTE_MAX_LENGTH = 255
 
+INDEXING_METHOD = "media.indexing"
+
+# Core notification method -> event entity event type
 EVENT_METHOD_MAP: dict[str, str] = {
     "media.started": "media_started",
     "media.stopped": "media_stopped",
-    "reader.added": "reader_added",
-    "reader.removed": "reader_removed",
+    "readers.added": "reader_added",
+    "readers.removed": "reader_removed",
     "tokens.added": "token_added",
     "tokens.removed": "token_removed",
-    "playtime.limit": "playtime_limit",
-    "indexing": "indexing",
+    "playtime.limit.reached": "playtime_limit",
+    "playtime.limit.warning": "playtime_limit",
+    INDEXING_METHOD: "indexing",
+    # Raised by the integration while running zaparoo.launch_sequence
+    "sequence.started": "sequence_started",
+    "sequence.step": "sequence_step",
+    "sequence.finished": "sequence_finished",
+    "sequence.cancelled": "sequence_cancelled",
+    "sequence.failed": "sequence_failed",
+}
+TRIGGER_TYPES = list(dict.fromkeys(EVENT_METHOD_MAP.values()))
+
+# Notification families that can be switched off in the options, and their
+# methods. Notifications of a family that is off are dropped on arrival.
+EVENT_FAMILIES: dict[str, tuple[str, ...]] = {
+    "media": ("media.started", "media.stopped"),
+    "indexing": (INDEXING_METHOD,),
+    "readers": ("readers.added", "readers.removed"),
+    "tokens": ("tokens.added", "tokens.removed"),
+    "playtime": ("playtime.limit.reached", "playtime.limit.warning"),
 }
-TRIGGER_TYPES = list(EVENT_METHOD_MAP.values())
+
+# Coordinator state slices. Entities subscribe to the slices they render so a
+# notification only wakes the entities whose state it actually changed.
+SLICE_MEDIA = "media"
+SLICE_READERS = "readers"
+SLICE_LAST_TOKEN = "last_token"  # noqa: S105
+SLICE_PLAYTIME = "playtime"
+SLICE_INDEXING = "indexing"
+SLICE_CONNECTION = "connection"
+SLICE_EVENT = "event"
+# Per-reader slices, notified when that one reader is added, changed or removed;
+# SLICE_READERS is notified for a change to any reader.
+SLICE_READER_PREFIX = "reader:"
+# Notified once state has been reconciled with the device after connecting.
+SLICE_RESYNC = "resync"
+
+# Device state saved across restarts and restored before entities are created.
+PERSISTED_SLICES = (SLICE_MEDIA, SLICE_READERS, SLICE_LAST_TOKEN, SLICE_PLAYTIME)
+
+# JSON-RPC scheduling: requests beyond the in-flight window wait in FIFO order,
+# and at most RPC_MAX_QUEUED may wait before new requests are rejected.
+RPC_MAX_IN_FLIGHT = 8
+RPC_MAX_QUEUED = 64
+DEFAULT_RPC_TIMEOUT = 10.0
+RPC_TIMEOUTS: dict[str, float] = {
+    "run": 10.0,
+    "stop": 10.0,
+    "media": 5.0,
+    "tokens": 5.0,
+    "readers": 5.0,
+    "playtime": 5.0,
+    "media.search": 15.0,
+}
+
+# Commands made while disconnected can wait in a per-device outbox for the
+# connection to return, up to OUTBOX_SIZE of them for DEFAULT_OUTBOX_TIMEOUT.
+OUTBOX_SIZE = 16
+DEFAULT_OUTBOX_TIMEOUT = 10.0
+
+# Read-only methods; concurrent identical calls may share one request.
+IDEMPOTENT_METHODS = frozenset(
+    {"media", "media.search", "systems", "tokens", "readers", "playtime"}
+)
+
+# The device is pinged this often. The link is only marked dead after this
+# many pings in a row go unanswered, each retried at once with twice the
+# previous timeout, so one slow pong on a busy host doesn't drop it.
+KEEPALIVE_INTERVAL = 5.0
+KEEPALIVE_MAX_MISSES = 2
+# RPC timeouts are at least this many times the link's current RTO.
+RPC_RTO_FACTOR = 2
+
+# zaparoo.media answers from push state confirmed within this many seconds.
+DEFAULT_MEDIA_MAX_AGE = 300.0
+
+# zaparoo.search results, dropped whenever the device finishes re-indexing.
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 300.0
+
+# zaparoo.history keeps this many notifications per method, in memory only.
+HISTORY_SIZE = 100
+DEFAULT_HISTORY_LIMIT = 20
+
+# zaparoo.launch_sequence limits.
+MAX_SEQUENCE_STEPS = 100
+DEFAULT_SEQUENCE_MEDIA_TIMEOUT = 60.0
+
+# Largest websocket frame accepted from the device.
+WS_MAX_MESSAGE_SIZE = 16 * 2**20
+
+# The library is mirrored one system at a time, LIBRARY_PAGE_SIZE entries per
+# media.search request. A device that can't page is asked for a system in one
+# request instead, if it has at most LIBRARY_MAX_RESULTS entries.
+LIBRARY_PAGE_SIZE = 1000
+LIBRARY_MAX_RESULTS = 50_000
+# A sync that fails while connected is retried after a growing delay.
+LIBRARY_RETRY_BASE_DELAY = 10.0
+LIBRARY_RETRY_MAX_DELAY = 600.0
+
+# Days of per-game play time kept, and the default zaparoo.playtime_report range.
+PLAYTIME_RETENTION_DAYS = 400
+DEFAULT_PLAYTIME_DAYS = 7
+
+# zaparoo.resolve_title matches, and the lowest similarity (0-1) of a match
+# that zaparoo.resolve_title returns or zaparoo.launch with a title launches.
+DEFAULT_TITLE_MATCHES = 5
+MIN_TITLE_SCORE = 0.3
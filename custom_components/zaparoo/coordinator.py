@@ -3,15 +3,46 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
-from .const import DOMAIN
+from .const import (
+    DEFAULT_INDEXING_WINDOW,
+    DOMAIN,
+    EVENT_FAMILIES,
+    HISTORY_SIZE,
+    INDEXING_METHOD,
+    SLICE_CONNECTION,
+    SLICE_EVENT,
+    SLICE_INDEXING,
+    SLICE_LAST_TOKEN,
+    SLICE_MEDIA,
+    SLICE_PLAYTIME,
+    SLICE_READER_PREFIX,
+    SLICE_READERS,
+    SLICE_RESYNC,
+)
+from .history import EventHistory
+from .indexing import IndexingCoalescer
+from .metrics import CoordinatorMetrics
+from .models import (
+    Indexing,
+    Media,
+    Playtime,
+    Reader,
+    Token,
+    ZaparooState,
+    scalar_attributes,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
     from homeassistant.core import HomeAssistant
 
     from .data import ZaparooDataConfigEntry
@@ -19,55 +50,412 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
-class ZaparooCoordinator(DataUpdateCoordinator):
+# Notifications that keep the media slice current.
+_MEDIA_METHODS = frozenset(EVENT_FAMILIES["media"])
+
+# Persisted slices restored by parsing their saved attributes; readers are
+# restored separately.
+_RESTORED_MODELS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    SLICE_MEDIA: Media.from_params,
+    SLICE_LAST_TOKEN: Token.from_params,
+    SLICE_PLAYTIME: Playtime.from_params,
+}
+
+
+def reader_slice(path: str) -> str:
+    """Return the state slice of the reader at path."""
+    return f"{SLICE_READER_PREFIX}{path}"
+
+
+def _attributes(model: Media | Token | Playtime | None) -> dict[str, Any] | None:
+    return None if model is None else model.attributes
+
+
+def _dicts_with_path(entries: Any) -> Iterator[dict[str, Any]]:
+    """Yield the well-formed reader entries of a query result or snapshot."""
+    for entry in entries or ():
+        if isinstance(entry, dict) and "path" in entry:
+            yield entry
+
+
+class ZaparooCoordinator(DataUpdateCoordinator[ZaparooState]):
     """Stores state pushed from websocket."""
 
     config_entry: ZaparooDataConfigEntry
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        indexing_window: float = DEFAULT_INDEXING_WINDOW,
+    ) -> None:
         """Init the cooridnator base state."""
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
-        self.data = {
-            "media": None,
-            "indexing": None,
-            "readers": {},
-            "last_token": None,
-            "playtime": None,
-            "connected": False,
+        self.data = ZaparooState()
+        # When media/database state was last confirmed by the device, while
+        # connected; None once the push stream may have missed changes.
+        self.media_synced_at: float | None = None
+        self.metrics = CoordinatorMetrics()
+        self.history = EventHistory(HISTORY_SIZE)
+        # slice -> listeners (dict used as an ordered set)
+        self._slice_listeners: dict[str, dict[CALLBACK_TYPE, None]] = {}
+        self._indexing = IndexingCoalescer(
+            hass,
+            indexing_window,
+            lambda params: self._apply_event(INDEXING_METHOD, params),
+        )
+        # Notification method -> handler, built once; see _apply_event.
+        self._handlers: dict[str, Callable[[Any, dict[str, Any]], set[str]]] = {
+            "media.started": self._on_media_started,
+            "media.stopped": self._on_media_stopped,
+            INDEXING_METHOD: self._on_indexing,
+            "readers.added": self._on_reader_added,
+            "readers.removed": self._on_reader_removed,
+            "tokens.added": self._on_token_added,
+            "tokens.removed": self._on_token_removed,
+            "playtime.limit.reached": self._on_playtime,
+            "playtime.limit.warning": self._on_playtime,
         }
+        # Methods worth decoding further; anything else is dropped on arrival.
+        # Narrowed by set_event_families.
+        self.event_methods: frozenset[str] = frozenset(self._handlers)
+        # Resync query method -> result handler, returning the slices changed.
+        self._resync: dict[str, Callable[[dict[str, Any]], set[str]]] = {
+            "media": self._apply_media,
+            "readers": self._apply_readers,
+            "tokens": self._apply_tokens,
+            "playtime": self._apply_playtime,
+        }
+        self.resync_methods: tuple[str, ...] = tuple(self._resync)
+
+    @property
+    def media_pushed(self) -> bool:
+        """Whether media changes are pushed, rather than filtered out."""
+        return self.event_methods >= _MEDIA_METHODS
+
+    def set_event_families(self, families: Iterable[str]) -> None:
+        """Only handle notifications of these families; see EVENT_FAMILIES."""
+        was_pushed = self.media_pushed
+        self.event_methods = frozenset(self._handlers) & {
+            method for family in families for method in EVENT_FAMILIES.get(family, ())
+        }
+        if self.media_pushed != was_pushed:
+            # Media changes were, or are about to be, missed: whatever is held
+            # is unconfirmed until the device next reports it.
+            self.media_synced_at = None
+            self._async_notify({SLICE_MEDIA})
+
+    @property
+    def indexing_window(self) -> float:
+        """Minimum seconds between indexing progress updates."""
+        return self._indexing.window
+
+    @indexing_window.setter
+    def indexing_window(self, window: float) -> None:
+        self._indexing.window = window
+
+    @property
+    def indexing_dropped(self) -> int:
+        """Indexing progress frames coalesced away since setup."""
+        return self._indexing.dropped_total
+
+    async def async_shutdown(self) -> None:
+        """Cancel any held-back indexing frame."""
+        self._indexing.cancel()
+        await super().async_shutdown()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """
+        Listen for data updates.
+
+        A frozenset context scopes the listener to those state slices, so it is
+        only called when one of them changes. Any other context falls back to
+        the default behaviour of being called on every update.
+        """
+        if not isinstance(context, frozenset):
+            return super().async_add_listener(update_callback, context)
+
+        for key in context:
+            self._slice_listeners.setdefault(key, {})[update_callback] = None
+
+        @callback
+        def remove_listener() -> None:
+            for key in context:
+                listeners = self._slice_listeners.get(key)
+                if listeners is not None:
+                    listeners.pop(update_callback, None)
+
+        return remove_listener
+
+    @callback
+    def async_add_reindexed_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the device finishing a media database re-index."""
+        was_indexing = self._is_indexing()
+
+        @callback
+        def _check() -> None:
+            nonlocal was_indexing
+            indexing = self._is_indexing()
+            if was_indexing and not indexing:
+                update_callback()
+            was_indexing = indexing
+
+        return self.async_add_listener(_check, frozenset({SLICE_INDEXING}))
+
+    def _is_indexing(self) -> bool:
+        return self.data.indexing is not None and self.data.indexing.indexing
+
+    @callback
+    def _async_notify(self, changed: set[str]) -> None:
+        """Call the listeners subscribed to any of the changed slices."""
+        if not changed:
+            return
+
+        self.last_update_success = True
+
+        # Collect first so an entity subscribed to several changed slices
+        # writes its state once, and listeners may unsubscribe while notified.
+        callbacks: dict[CALLBACK_TYPE, None] = {}
+        for key in changed:
+            listeners = self._slice_listeners.get(key)
+            if listeners:
+                callbacks.update(listeners)
+
+        self.metrics.listener_calls += len(callbacks)
+        for update_callback in callbacks:
+            update_callback()
+
+        self.async_update_listeners()
+
+    def _set(self, key: str, value: Any) -> bool:
+        """Store a value, returning whether it differs from the current one."""
+        if getattr(self.data, key) == value:
+            return False
+        setattr(self.data, key, value)
+        return True
 
     def handle_ws_event(self, method: str, params: dict) -> None:
         """Call when websocket_client wevent occurs."""
-        if method == "media.started":
-            self.data["media"] = params
-        elif method == "media.stopped":
-            self.data["media"] = None
-        elif method == "media.indexing":
-            self.data["indexing"] = params
-        elif method == "readers.added":
-            self.data["readers"][params["path"]] = params
-        elif method == "readers.removed":
-            self.data["readers"].pop(params["path"], None)
-        elif method == "tokens.added":
-            self.data["last_token"] = params
-        elif method == "tokens.removed":
-            self.data["last_token"] = None
-        elif method.startswith("playtime.limit"):
-            self.data["playtime"] = params
-
-        self.data["last_event_method"] = method
-        self.data["last_event_params"] = params
-
-        self.async_set_updated_data(self.data)
+        if method == INDEXING_METHOD:
+            # Re-indexing streams progress; the coalescer rate-limits it and
+            # calls back into _apply_event.
+            self._indexing.push(params)
+            return
+
+        self._apply_event(method, params)
+
+    def _apply_event(self, method: str, params: dict) -> None:
+        """Store a notification and notify the slices it changed."""
+        handler = self._handlers.get(method)
+        if handler is None:
+            return
+
+        # Copied once here and shared by the model and the event entities.
+        attributes = scalar_attributes(params)
+        changed = handler(params, attributes)
+        self.history.append(method, attributes)
+        self.metrics.events += 1
+        if not changed:
+            self.metrics.events_unchanged += 1
+
+        # Every notification is an event, even when it changed no state.
+        self.data.last_event_method = method
+        self.data.last_event_attributes = attributes
+
+        changed.add(SLICE_EVENT)
+        self._async_notify(changed)
+
+    def emit_event(self, method: str, params: dict[str, Any]) -> None:
+        """Fire an event raised by the integration itself, not the device."""
+        attributes = scalar_attributes(params)
+        self.history.append(method, attributes)
+        self.data.last_event_method = method
+        self.data.last_event_attributes = attributes
+        self._async_notify({SLICE_EVENT})
+
+    # Notification handlers: apply params, whose scalar_attributes are given
+    # alongside, and return the slices they changed.
+
+    def _on_media_started(self, params: dict, attributes: dict) -> set[str]:
+        newly_confirmed = self._confirm_media()
+        media = Media.from_params(params, attributes)
+        return (
+            {SLICE_MEDIA} if self._set(SLICE_MEDIA, media) or newly_confirmed else set()
+        )
+
+    def _on_media_stopped(self, _params: dict | None, _attributes: dict) -> set[str]:
+        newly_confirmed = self._confirm_media()
+        return (
+            {SLICE_MEDIA} if self._set(SLICE_MEDIA, None) or newly_confirmed else set()
+        )
+
+    def _confirm_media(self) -> bool:
+        """Mark media as confirmed now, returning whether it wasn't before."""
+        was_unconfirmed = self.media_synced_at is None
+        self.media_synced_at = time.monotonic()
+        return was_unconfirmed
+
+    def _on_indexing(self, params: dict, attributes: dict) -> set[str]:
+        indexing = Indexing.from_params(params, attributes)
+        return {SLICE_INDEXING} if self._set(SLICE_INDEXING, indexing) else set()
+
+    def _on_reader_added(self, params: dict, attributes: dict) -> set[str]:
+        reader = Reader.from_params(params, attributes)
+        readers = self.data.readers
+        if readers.get(reader.path) == reader:
+            return set()
+        readers[reader.path] = reader
+        return {SLICE_READERS, reader_slice(reader.path)}
+
+    def _on_reader_removed(self, params: dict, _attributes: dict) -> set[str]:
+        if self.data.readers.pop(params["path"], None) is None:
+            return set()
+        return {SLICE_READERS, reader_slice(params["path"])}
+
+    def _on_token_added(self, params: dict, attributes: dict) -> set[str]:
+        token = Token.from_params(params, attributes)
+        return {SLICE_LAST_TOKEN} if self._set(SLICE_LAST_TOKEN, token) else set()
+
+    def _on_token_removed(self, _params: dict | None, _attributes: dict) -> set[str]:
+        return {SLICE_LAST_TOKEN} if self._set(SLICE_LAST_TOKEN, None) else set()
+
+    def _on_playtime(self, params: dict, attributes: dict) -> set[str]:
+        playtime = Playtime.from_params(params, attributes)
+        return {SLICE_PLAYTIME} if self._set(SLICE_PLAYTIME, playtime) else set()
+
+    def apply_media_result(self, result: dict[str, Any]) -> None:
+        """Store the media and database state returned by a media query."""
+        self._async_notify(self._apply_media(result))
+
+    def apply_resync(self, results: dict[str, Any]) -> None:
+        """
+        Apply the answers to an on-connect resync as one update.
+
+        results maps each query method to its result, or None when that query
+        failed, in which case its state is left as it was.
+        """
+        changed = {SLICE_RESYNC}
+        for method, result in results.items():
+            if isinstance(result, dict) and (apply := self._resync.get(method)):
+                changed |= apply(result)
+        self._async_notify(changed)
+
+    def _apply_media(self, result: dict[str, Any]) -> set[str]:
+        changed: set[str] = set()
+        newly_confirmed = self._confirm_media()
+        active = result.get("active") or []
+        media = Media.from_params(active[0]) if active else None
+        if self._set(SLICE_MEDIA, media) or newly_confirmed:
+            changed.add(SLICE_MEDIA)
+        database = result.get("database")
+        if database is not None and self._set(
+            SLICE_INDEXING, Indexing.from_params(database)
+        ):
+            changed.add(SLICE_INDEXING)
+        return changed
+
+    def _apply_readers(self, result: dict[str, Any]) -> set[str]:
+        return self._replace_readers(result.get("readers"))
+
+    def _replace_readers(self, entries: Any) -> set[str]:
+        """Store a new list of readers, returning the slices of those changed."""
+        readers = {
+            reader.path: reader
+            for reader in map(Reader.from_params, _dicts_with_path(entries))
+        }
+        current = self.data.readers
+        changed = {
+            reader_slice(path)
+            for path in current.keys() | readers.keys()
+            if current.get(path) != readers.get(path)
+        }
+        if changed:
+            self.data.readers = readers
+            changed.add(SLICE_READERS)
+        return changed
+
+    def _apply_tokens(self, result: dict[str, Any]) -> set[str]:
+        last = result.get("last")
+        token = Token.from_params(last) if isinstance(last, dict) else None
+        return {SLICE_LAST_TOKEN} if self._set(SLICE_LAST_TOKEN, token) else set()
+
+    def _apply_playtime(self, result: dict[str, Any]) -> set[str]:
+        playtime = Playtime.from_params(result)
+        return {SLICE_PLAYTIME} if self._set(SLICE_PLAYTIME, playtime) else set()
+
+    def persisted_state(self) -> dict[str, Any]:
+        """Return the device state worth keeping across a restart."""
+        data = self.data
+        return {
+            SLICE_MEDIA: _attributes(data.media),
+            SLICE_READERS: {
+                path: reader.as_params() for path, reader in data.readers.items()
+            },
+            SLICE_LAST_TOKEN: _attributes(data.last_token),
+            SLICE_PLAYTIME: _attributes(data.playtime),
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        """
+        Seed device state saved by a previous run.
+
+        Restored state is shown until the device reports otherwise, but never
+        counts as confirmed: media_synced_at stays unset until it does.
+        """
+        changed: set[str] = set()
+        for key, parse in _RESTORED_MODELS.items():
+            value = snapshot.get(key)
+            if self._set(key, parse(value) if isinstance(value, dict) else None):
+                changed.add(key)
+        readers = snapshot.get(SLICE_READERS)
+        changed |= self._replace_readers(
+            readers.values() if isinstance(readers, dict) else ()
+        )
+        self._async_notify(changed)
+
+    def media_snapshot(self, max_age: float) -> dict[str, Any] | None:
+        """
+        Answer a media query from push state.
+
+        Returns None unless the state was confirmed by the device within
+        max_age seconds, the connection has stayed up since and media and
+        indexing notifications are being handled to keep it current.
+        """
+        synced_at = self.media_synced_at
+        indexing = self.data.indexing
+        if (
+            not self.media_pushed
+            or INDEXING_METHOD not in self.event_methods
+            or synced_at is None
+            or indexing is None
+            or not self.data.connected
+            or time.monotonic() - synced_at > max_age
+        ):
+            return None
+
+        media = self.data.media
+        return {
+            "database": indexing.as_database(),
+            "active": [media.attributes] if media else [],
+        }
 
     def disconnected(self) -> None:
         """Set connected to false."""
-        self.data["connected"] = False
-        self.data["last_event_method"] = None
-        self.data["last_event_params"] = None
-        self.async_set_updated_data(self.data)
+        self.media_synced_at = None
+        changed: set[str] = set()
+        if self._set("connected", value=False):
+            changed.add(SLICE_CONNECTION)
+        if self.data.last_event_method is not None:
+            self.data.last_event_method = None
+            self.data.last_event_attributes = None
+            changed.add(SLICE_EVENT)
+        self._async_notify(changed)
 
     def connected(self) -> None:
         """Set connected to true."""
-        self.data["connected"] = True
-        self.async_set_updated_data(self.data)
+        if self._set("connected", value=True):
+            self._async_notify({SLICE_CONNECTION})
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .attributes import AttributePolicy
+from .cache import LRUTTLCache
+from .const import SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -12,6 +16,10 @@ if TYPE_CHECKING:
     from custom_components.zaparoo.websocket_client import ZaparooWebSocket
 
     from .coordinator import ZaparooCoordinator
+    from .library import ZaparooLibrary
+    from .playtime import PlaytimeLedger
+    from .sequence import LaunchSequencer
+    from .store import ZaparooStateStore
 
 
 type ZaparooDataConfigEntry = ConfigEntry[ZaparooData]
@@ -24,3 +32,12 @@ class ZaparooData:
     client: ZaparooWebSocket
     coordinator: ZaparooCoordinator
     integration: Integration
+    state_store: ZaparooStateStore
+    sequencer: LaunchSequencer
+    library: ZaparooLibrary
+    playtime: PlaytimeLedger
+    attribute_policy: AttributePolicy = field(default_factory=AttributePolicy)
+    # (query, systems, max results) -> media.search result
+    search_cache: LRUTTLCache[tuple[str, tuple[str, ...], int | None], Any] = field(
+        default_factory=lambda: LRUTTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+    )
@@ -0,0 +1,138 @@
+"""Cached device/area to entry data lookup for service calls."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import ZaparooData
+    from .websocket_client import ZaparooWebSocket
+
+DATA_DEVICE_INDEX: HassKey[ZaparooDeviceIndex] = HassKey(f"{DOMAIN}_device_index")
+
+
+@callback
+def async_get_device_index(hass: HomeAssistant) -> ZaparooDeviceIndex:
+    """Return the shared device index, creating it on first use."""
+    if (index := hass.data.get(DATA_DEVICE_INDEX)) is None:
+        index = hass.data[DATA_DEVICE_INDEX] = ZaparooDeviceIndex(hass)
+    return index
+
+
+class ZaparooDeviceIndex:
+    """
+    Map device and area IDs to the runtime data of their config entry.
+
+    The maps are rebuilt lazily on the first lookup after a config entry is
+    set up or unloaded, or a registry change that moves a Zaparoo device:
+    one created for or removed from an indexed entry, or a change to a
+    device's config entries or an indexed device's area. Resolving service
+    targets is a dict lookup per device. The registry is only followed while
+    at least one entry is indexed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init an empty index."""
+        self.hass = hass
+        self._entries: dict[str, ZaparooData] = {}
+        self._by_device: dict[str, ZaparooData] = {}
+        self._by_area: dict[str, list[str]] = {}
+        self._dirty = True
+        self._unsub_registry: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_entry(self, entry_id: str, data: ZaparooData) -> CALLBACK_TYPE:
+        """Index a loaded config entry; returns a callback that removes it."""
+        self._entries[entry_id] = data
+        self._dirty = True
+        if self._unsub_registry is None:
+            self._unsub_registry = self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_invalidate,
+                event_filter=self._async_moves_device,
+            )
+
+        @callback
+        def remove_entry() -> None:
+            self._entries.pop(entry_id, None)
+            self._dirty = True
+            if not self._entries and self._unsub_registry is not None:
+                # The last entry is gone; stop following the registry.
+                self._unsub_registry()
+                self._unsub_registry = None
+
+        return remove_entry
+
+    @callback
+    def _async_moves_device(
+        self, event_data: dr.EventDeviceRegistryUpdatedData
+    ) -> bool:
+        """Return whether a registry change can alter the maps."""
+        if self._dirty:
+            # Rebuilt on the next lookup anyway.
+            return False
+        device_id = event_data["device_id"]
+        if event_data["action"] == "create":
+            device = dr.async_get(self.hass).async_get(device_id)
+            return device is not None and not self._entries.keys().isdisjoint(
+                device.config_entries
+            )
+        if event_data["action"] == "remove":
+            return device_id in self._by_device
+        changes = event_data["changes"]
+        return "config_entries" in changes or (
+            "area_id" in changes and device_id in self._by_device
+        )
+
+    @callback
+    def _async_invalidate(self, _event: Event | None = None) -> None:
+        self._dirty = True
+
+    def _rebuild(self) -> None:
+        """Walk the registry for the devices of every indexed entry."""
+        device_reg = dr.async_get(self.hass)
+        by_device: dict[str, ZaparooData] = {}
+        by_area: dict[str, list[str]] = {}
+
+        for entry_id, data in self._entries.items():
+            for device in dr.async_entries_for_config_entry(device_reg, entry_id):
+                by_device[device.id] = data
+                if device.area_id:
+                    by_area.setdefault(device.area_id, []).append(device.id)
+
+        self._by_device = by_device
+        self._by_area = by_area
+        self._dirty = False
+
+    @callback
+    def async_get_data(self, device_id: str) -> ZaparooData:
+        """Return the entry runtime data for a Zaparoo device."""
+        if self._dirty:
+            self._rebuild()
+
+        if (data := self._by_device.get(device_id)) is None:
+            msg = f"Zaparoo device not found: {device_id}"
+            raise HomeAssistantError(msg)
+
+        return data
+
+    @callback
+    def async_get_client(self, device_id: str) -> ZaparooWebSocket:
+        """Return the client for a Zaparoo device."""
+        return self.async_get_data(device_id).client
+
+    @callback
+    def async_device_ids_for_area(self, area_id: str) -> list[str]:
+        """Return the Zaparoo devices assigned to an area."""
+        if self._dirty:
+            self._rebuild()
+        return self._by_area.get(area_id, [])
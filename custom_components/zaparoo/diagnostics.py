@@ -0,0 +1,61 @@
+"""Diagnostics support for Zaparoo."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_HOST
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import ZaparooDataConfigEntry
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Required
+    entry: ZaparooDataConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = entry.runtime_data
+    client = data.client
+    coordinator = data.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            "connected": coordinator.data.connected,
+            "pending_requests": client.pending_requests,
+            "queued_requests": client.queued_requests,
+            "outbox_requests": client.outbox_requests,
+        },
+        "client": client.metrics.as_dict(),
+        "rtt": client.rtt.as_dict(),
+        "coordinator": {
+            **coordinator.metrics.as_dict(),
+            "indexing_dropped": coordinator.indexing_dropped,
+            "history_size": len(coordinator.history),
+        },
+        "library": {
+            "systems": len(data.library.systems),
+            "media": data.library.size,
+            "synced_at": data.library.synced_at,
+        },
+        "playtime": {
+            "today": round(data.playtime.today()),
+            "this_week": round(data.playtime.this_week()),
+            "timing": data.playtime.game is not None,
+        },
+        "search_cache": {
+            "size": len(data.search_cache),
+            "hits": data.search_cache.hits,
+            "misses": data.search_cache.misses,
+        },
+    }
@@ -8,7 +8,8 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.components.event import EventEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import EVENT_METHOD_MAP, TRIGGER_TYPES
+from .attributes import VOLATILE_ATTRIBUTES
+from .const import EVENT_METHOD_MAP, SLICE_EVENT, TRIGGER_TYPES
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -36,12 +37,13 @@ class ZaparooEventEntity(CoordinatorEntity, EventEntity):
     _attr_has_entity_name = True
     _attr_name = "Zaparoo Events"
     _attr_icon = "mdi:bell-ring"
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
 
     def __init__(
         self, entry: ZaparooDataConfigEntry, coordinator: ZaparooCoordinator
     ) -> None:
         """Init the actual config entry."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({SLICE_EVENT}))
         self.entry = entry
         self._attr_unique_id = f"{entry.entry_id}_event_stream"
 
@@ -52,13 +54,19 @@ class ZaparooEventEntity(CoordinatorEntity, EventEntity):
 
     @property
     def _event_data(self) -> Any:
-        """Return last event data from coordinator."""
-        return self.coordinator.data.get("last_event_params")
+        """
+        Return last event data from coordinator, as attributes.
+
+        Automations act on these, so unlike sensor attributes they are not
+        run through the attribute policy: every scalar field is passed on
+        whole.
+        """
+        return self.coordinator.data.last_event_attributes
 
     @property
     def _event_type(self) -> str | None:
         """Return last event type from coordinator."""
-        method = self.coordinator.data.get("last_event_method")
+        method = self.coordinator.data.last_event_method
         if not method:
             return None
 
@@ -0,0 +1,118 @@
+"""Bounded in-memory history of the notifications a device has sent."""
+
+from __future__ import annotations
+
+import heapq
+import time
+from collections import deque
+from itertools import islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+_by_time = attrgetter("timestamp")
+
+
+class EventRecord:
+    """One notification, as kept by EventHistory."""
+
+    __slots__ = ("method", "params", "timestamp")
+
+    def __init__(
+        self, timestamp: float, method: str, params: dict[str, Any] | None
+    ) -> None:
+        """Init the record."""
+        self.timestamp = timestamp
+        self.method = method
+        self.params = params
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record for a service response."""
+        return {
+            "timestamp": dt_util.utc_from_timestamp(self.timestamp).isoformat(),
+            "method": self.method,
+            "params": self.params,
+        }
+
+
+class EventHistory:
+    """
+    Fixed-capacity ring buffer of notifications, one ring per method.
+
+    Keeping a ring per method means a burst of one kind of notification
+    (indexing progress, say) can't push the others out, and the latest k
+    events of a method are read in O(k). Queries over several methods merge
+    the rings newest first.
+    """
+
+    __slots__ = ("_rings", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        """Init an empty history keeping up to capacity events per method."""
+        self.capacity = capacity
+        self._rings: dict[str, deque[EventRecord]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of records held across all methods."""
+        return sum(map(len, self._rings.values()))
+
+    def append(self, method: str, attributes: dict[str, Any]) -> None:
+        """
+        Record a notification received now.
+
+        attributes are the notification's scalar_attributes, as already
+        copied by the coordinator; the record shares them rather than keeping
+        the raw params.
+        """
+        if (ring := self._rings.get(method)) is None:
+            ring = self._rings[method] = deque(maxlen=self.capacity)
+        ring.append(EventRecord(time.time(), method, attributes))
+
+    def clear(self) -> None:
+        """Drop every record."""
+        self._rings.clear()
+
+    def query(
+        self,
+        methods: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """
+        Return matching records, newest first.
+
+        methods limits the result to those notification methods; start and
+        end bound the receive time as a Unix timestamp, inclusive.
+        """
+        if methods is None:
+            rings = list(self._rings.values())
+        else:
+            rings = [ring for m in set(methods) if (ring := self._rings.get(m))]
+
+        records: Iterator[EventRecord]
+        if len(rings) == 1:
+            records = reversed(rings[0])
+        else:
+            records = heapq.merge(
+                *(reversed(ring) for ring in rings), key=_by_time, reverse=True
+            )
+
+        matched = self._between(records, start, end)
+        return list(matched if limit is None else islice(matched, limit))
+
+    @staticmethod
+    def _between(
+        records: Iterator[EventRecord], start: float | None, end: float | None
+    ) -> Iterator[EventRecord]:
+        for record in records:
+            if end is not None and record.timestamp > end:
+                continue
+            if start is not None and record.timestamp < start:
+                # Newest first, so everything after this is older still.
+                return
+            yield record
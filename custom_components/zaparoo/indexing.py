@@ -0,0 +1,88 @@
+"""Coalescing of media.indexing progress notifications."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+
+class IndexingCoalescer:
+    """
+    Rate-limit indexing progress to at most one update per window.
+
+    Start and finish transitions are always passed through immediately. In
+    between, only the latest progress frame is kept and emitted at the end of
+    the window; every frame that never gets emitted is counted as dropped and
+    reported on the next emitted frame under "coalesced".
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: float,
+        emit: Callable[[dict[str, Any]], None],
+    ) -> None:
+        """Init the coalescer."""
+        self.hass = hass
+        self.window = window
+        self.dropped_total = 0
+        self._emit_cb = emit
+        self._active: bool | None = None
+        self._last_emit = 0.0
+        self._pending: dict[str, Any] | None = None
+        self._dropped = 0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def push(self, params: dict[str, Any]) -> None:
+        """Accept an indexing notification."""
+        active = bool(params.get("indexing"))
+        transition = active != self._active
+        self._active = active
+
+        now = time.monotonic()
+        if transition or now - self._last_emit >= self.window:
+            if self._pending is not None:
+                # Superseded before its window closed.
+                self._dropped += 1
+            self._emit(params, now)
+            return
+
+        if self._pending is not None:
+            self._dropped += 1
+        self._pending = params
+        if self._unsub_timer is None:
+            self._unsub_timer = async_call_later(
+                self.hass, self._last_emit + self.window - now, self._flush
+            )
+
+    @callback
+    def _flush(self, _now: datetime) -> None:
+        """Emit the latest progress frame held back during the window."""
+        self._unsub_timer = None
+        if self._pending is not None:
+            self._emit(self._pending, time.monotonic())
+
+    def _emit(self, params: dict[str, Any], now: float) -> None:
+        self.cancel()
+        self._last_emit = now
+        self.dropped_total += self._dropped
+        dropped, self._dropped = self._dropped, 0
+        self._emit_cb({**params, "coalesced": dropped})
+
+    @callback
+    def cancel(self) -> None:
+        """Drop any held-back frame and its timer."""
+        self._pending = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
@@ -0,0 +1,383 @@
+"""Local mirror of a device's media library, kept under .storage."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    LIBRARY_MAX_RESULTS,
+    LIBRARY_PAGE_SIZE,
+    LIBRARY_RETRY_BASE_DELAY,
+    LIBRARY_RETRY_MAX_DELAY,
+    SLICE_RESYNC,
+)
+from .reconnect import ReconnectBackoff
+from .titles import TitleIndex
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ZaparooCoordinator
+    from .websocket_client import ZaparooWebSocket
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.library"
+
+
+class ZaparooLibrary:
+    """
+    Systems and media titles of one device, mirrored to disk.
+
+    The mirror is loaded on first use rather than at startup. It is synced
+    one system at a time, and progress is saved as it goes, so a sync cut
+    short by a disconnect resumes with the systems it had left. The whole
+    library is only downloaded again after the device re-indexes, or when
+    its file count no longer matches the mirror's. Each system is fetched in
+    pages and only kept once every entry the device counted has arrived. A
+    sync that fails while the device stays connected is retried with backoff;
+    one cut short by a disconnect waits for the reconnect. A trigram index of
+    the titles, for resolving names to media, is rebuilt in the executor
+    after every sync that changed the mirror.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        client: ZaparooWebSocket,
+        coordinator: ZaparooCoordinator,
+    ) -> None:
+        """Init an unloaded mirror."""
+        self.hass = hass
+        self.client = client
+        self.coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._sync_task: asyncio.Task[None] | None = None
+        self._check_again = False
+        self._retry = ReconnectBackoff(
+            LIBRARY_RETRY_BASE_DELAY, LIBRARY_RETRY_MAX_DELAY
+        )
+        self._index = TitleIndex()
+        self._index_task: asyncio.Task[None] | None = None
+
+        # system ID -> system as returned by the systems query
+        self.systems: dict[str, dict[str, Any]] = {}
+        # system ID -> [(name, path), ...]
+        self.media: dict[str, list[tuple[str, str]]] = {}
+        # Systems still to be fetched by the current sync
+        self._pending: list[str] = []
+        # Device file count the mirror was synced against
+        self._total_files: int | None = None
+        self.synced_at: float | None = None
+
+    @property
+    def size(self) -> int:
+        """Number of mirrored media entries."""
+        return sum(map(len, self.media.values()))
+
+    async def async_load(self) -> None:
+        """Read the mirror from disk, once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if data := await self._store.async_load():
+                self.systems = data.get("systems") or {}
+                self.media = {
+                    system_id: [(name, path) for name, path in entries]
+                    for system_id, entries in (data.get("media") or {}).items()
+                }
+                self._pending = data.get("pending") or []
+                self._total_files = data.get("total_files")
+                self.synced_at = data.get("synced_at")
+            self._loaded = True
+            if self.media:
+                self._async_rebuild_index()
+
+    async def async_save(self) -> None:
+        """Write the mirror now, replacing any delayed save."""
+        if self._loaded:
+            await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "systems": self.systems,
+            "media": self.media,
+            "pending": self._pending,
+            "total_files": self._total_files,
+            "synced_at": self.synced_at,
+        }
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Follow the device and sync when needed; returns a stop callback."""
+        remove_reindexed = self.coordinator.async_add_reindexed_listener(
+            self._async_reindexed
+        )
+        remove_resync = self.coordinator.async_add_listener(
+            self._async_resynced, frozenset({SLICE_RESYNC})
+        )
+
+        @callback
+        def stop() -> None:
+            remove_reindexed()
+            remove_resync()
+            if self._sync_task is not None:
+                self._sync_task.cancel()
+                self._sync_task = None
+            if self._index_task is not None:
+                self._index_task.cancel()
+                self._index_task = None
+
+        return stop
+
+    @callback
+    def _async_reindexed(self) -> None:
+        self._async_schedule_sync(full=True)
+
+    @callback
+    def _async_resynced(self) -> None:
+        # Connected, with the device's file count freshly confirmed.
+        self._async_schedule_sync(full=False)
+
+    @callback
+    def _async_schedule_sync(self, *, full: bool) -> None:
+        if self._sync_task is not None:
+            if not full:
+                # Reconnected mid-sync; check again once done.
+                self._check_again = True
+                return
+            # A re-index makes whatever the running sync fetched stale.
+            self._sync_task.cancel()
+        self._sync_task = self.hass.async_create_background_task(
+            self._async_run(full=full), "zaparoo library sync"
+        )
+
+    async def _async_run(self, *, full: bool) -> None:
+        try:
+            while True:
+                self._check_again = False
+                try:
+                    await self._async_sync(full=full)
+                except HomeAssistantError as err:
+                    if not self.coordinator.data.connected:
+                        # Resumed from the pending systems on the next connect.
+                        _LOGGER.debug("Zaparoo library sync interrupted: %s", err)
+                        return
+                    delay = self._retry.next_delay()
+                    _LOGGER.debug(
+                        "Zaparoo library sync failed, retrying in %.0fs: %s",
+                        delay,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                self._retry.reset()
+                if not self._check_again:
+                    return
+                full = False
+        finally:
+            if self._sync_task is asyncio.current_task():
+                self._sync_task = None
+
+    async def _async_sync(self, *, full: bool) -> None:
+        await self.async_load()
+        database = self.coordinator.data.indexing
+        if database is not None and database.indexing:
+            return
+
+        total_files = database.total_files if database is not None else None
+        if total_files is not None and total_files != self._total_files:
+            full = True
+        if full or not self.systems:
+            await self._async_start_full_sync(total_files)
+
+        fetched = False
+        while self._pending:
+            system_id = self._pending[0]
+            self.media[system_id] = await self._async_fetch_system(system_id)
+            self._pending.pop(0)
+            fetched = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+        if full or fetched:
+            self.synced_at = time.time()
+            self._async_rebuild_index()
+            await self._store.async_save(self._data_to_save())
+            _LOGGER.debug(
+                "Zaparoo library synced: %s systems, %s media",
+                len(self.systems),
+                self.size,
+            )
+
+    async def _async_start_full_sync(self, total_files: int | None) -> None:
+        result = await self._async_call("systems")
+        systems = {
+            system["id"]: system
+            for system in result.get("systems") or []
+            if isinstance(system, dict) and "id" in system
+        }
+        self.systems = systems
+        self.media = {
+            system_id: entries
+            for system_id, entries in self.media.items()
+            if system_id in systems
+        }
+        self._pending = sorted(systems)
+        self._total_files = total_files
+
+    async def _async_fetch_system(self, system_id: str) -> list[tuple[str, str]]:
+        """
+        Fetch every media entry of one system, a page at a time.
+
+        Pages are requested with the cursor of the previous one. A device
+        that doesn't page is asked for the whole system in one request, as
+        long as its count is within LIBRARY_MAX_RESULTS. Raises if fewer
+        entries arrive than the device counted, so a cut-short result is
+        never mistaken for the whole system.
+        """
+        params: dict[str, Any] = {
+            "query": "",
+            "systems": [system_id],
+            "maxResults": LIBRARY_PAGE_SIZE,
+        }
+        entries: list[tuple[str, str]] = []
+        while True:
+            result = await self._async_call("media.search", params)
+            entries.extend(_entries(result))
+            total = result.get("total")
+            pagination = result.get("pagination")
+            if isinstance(pagination, dict):
+                cursor = pagination.get("nextCursor")
+                if pagination.get("hasNextPage") and cursor:
+                    params["cursor"] = cursor
+                    continue
+            elif isinstance(total, int) and len(entries) < total:
+                if total > LIBRARY_MAX_RESULTS:
+                    msg = (
+                        f"{system_id} has {total} media, more than the "
+                        f"{LIBRARY_MAX_RESULTS} a device without paging can send"
+                    )
+                    raise HomeAssistantError(msg)
+                result = await self._async_call(
+                    "media.search", {**params, "maxResults": total}
+                )
+                entries = _entries(result)
+                total = result.get("total")
+            break
+
+        if isinstance(total, int) and len(entries) < total:
+            msg = f"{system_id} media cut short: {len(entries)} of {total} received"
+            raise HomeAssistantError(msg)
+        return entries
+
+    async def _async_call(self, method: str, params: Any | None = None) -> Any:
+        try:
+            response = await self.client.send_jsonrpc(method, params)
+        except HomeAssistantError:
+            raise
+        except Exception as err:
+            raise HomeAssistantError(str(err)) from err
+
+        if isinstance(response, dict) and "error" in response:
+            raise HomeAssistantError(response["error"])
+        result = response.get("result") if isinstance(response, dict) else None
+        return result if isinstance(result, dict) else {}
+
+    async def async_search(
+        self, query: str, systems: list[str], max_results: int | None
+    ) -> dict[str, Any]:
+        """
+        Search the mirror, answering in the shape of a media.search result.
+
+        The scan runs in the executor, since a large mirror takes a while.
+        A sync replaces a system's list rather than changing it, so a copy
+        of the outer map is all the scan needs.
+        """
+        await self.async_load()
+        return await self.hass.async_add_executor_job(
+            self._search, dict(self.media), query, systems, max_results
+        )
+
+    def _search(
+        self,
+        media: dict[str, list[tuple[str, str]]],
+        query: str,
+        systems: list[str],
+        max_results: int | None,
+    ) -> dict[str, Any]:
+        needle = query.casefold()
+        results = [
+            self._as_result(system_id, name, path)
+            for system_id in (systems or media)
+            for name, path in media.get(system_id, ())
+            if needle in name.casefold()
+        ]
+        total = len(results)
+        if max_results is not None:
+            results = results[:max_results]
+        return {"results": results, "total": total}
+
+    async def async_get_title_index(self) -> TitleIndex:
+        """Return the title index, waiting for any rebuild in progress."""
+        await self.async_load()
+        while (task := self._index_task) is not None and not task.done():
+            # Shielded so a caller giving up doesn't abandon the rebuild.
+            await asyncio.shield(task)
+        return self._index
+
+    @callback
+    def _async_rebuild_index(self) -> None:
+        """Rebuild the title index in the executor from the current mirror."""
+        entries = [
+            (system_id, name, path)
+            for system_id, media in self.media.items()
+            for name, path in media
+        ]
+        self._index_task = self.hass.async_create_background_task(
+            self._async_build_index(entries), "zaparoo title index"
+        )
+
+    async def _async_build_index(self, entries: list[tuple[str, str, str]]) -> None:
+        index = await self.hass.async_add_executor_job(TitleIndex.build, entries)
+        # A newer rebuild may have started meanwhile; only its index is current.
+        if self._index_task is asyncio.current_task():
+            self._index = index
+            _LOGGER.debug("Zaparoo title index rebuilt: %s titles", len(index))
+
+    def _as_result(self, system_id: str, name: str, path: str) -> dict[str, Any]:
+        return {
+            "system": self.systems.get(system_id, {"id": system_id}),
+            "name": name,
+            "path": path,
+        }
+
+
+def _entries(result: dict[str, Any]) -> list[tuple[str, str]]:
+    return [
+        (media.get("name") or "", media.get("path") or "")
+        for media in result.get("results") or []
+        if isinstance(media, dict)
+    ]
+
+
+async def async_remove_library(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the mirror of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
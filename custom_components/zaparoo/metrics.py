@@ -0,0 +1,196 @@
+"""Low-overhead connection and RPC metrics."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Any
+
+# Upper bounds of the RPC latency histogram buckets, in milliseconds. Anything
+# slower lands in a final overflow bucket.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Messages per second is averaged over the last RATE_WINDOW seconds, estimated
+# when read from the counts of the current and previous fixed windows.
+RATE_WINDOW = 10.0
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("bounds", "count", "counts", "total_ms")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Init an empty histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Return the upper bound of the bucket holding the q-th quantile.
+
+        Samples in the overflow bucket report the largest bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"le_{bound}ms" for bound in self.bounds] + ["overflow"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class ClientMetrics:
+    """Counters kept by a ZaparooWebSocket."""
+
+    __slots__ = (
+        "_previous_count",
+        "_window_count",
+        "_window_start",
+        "connect_failures",
+        "connects",
+        "disconnects",
+        "keepalive_failures",
+        "late_responses",
+        "messages",
+        "notifications",
+        "notifications_ignored",
+        "orphaned_responses",
+        "outbox_expired",
+        "outbox_queued",
+        "rpc_failures",
+        "rpc_latency",
+        "rpc_requests",
+        "rpc_shared",
+        "rpc_timeouts",
+    )
+
+    def __init__(self) -> None:
+        """Init all counters at zero."""
+        self.connects = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+        self.keepalive_failures = 0
+        self.messages = 0
+        self.notifications = 0
+        self.notifications_ignored = 0
+        self.rpc_requests = 0
+        self.rpc_shared = 0
+        self.rpc_failures = 0
+        self.rpc_timeouts = 0
+        self.late_responses = 0
+        self.orphaned_responses = 0
+        self.outbox_queued = 0
+        self.outbox_expired = 0
+        self.rpc_latency = LatencyHistogram()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._previous_count = 0
+
+    def record_message(self) -> None:
+        """Count a received frame."""
+        self.messages += 1
+        self._roll(time.monotonic())
+        self._window_count += 1
+
+    def _roll(self, now: float) -> None:
+        """Start a new rate window if the current one has elapsed."""
+        elapsed = now - self._window_start
+        if elapsed < RATE_WINDOW:
+            return
+        # After a gap longer than a window, the previous window was empty too.
+        self._previous_count = self._window_count if elapsed < 2 * RATE_WINDOW else 0
+        self._window_count = 0
+        self._window_start = now - elapsed % RATE_WINDOW
+
+    @property
+    def messages_per_second(self) -> float:
+        """
+        Frames received per second over the last RATE_WINDOW seconds.
+
+        Worked out from the current time when read, so it falls to zero once
+        frames stop arriving rather than holding the last busy window's rate.
+        """
+        now = time.monotonic()
+        self._roll(now)
+        previous_share = 1 - (now - self._window_start) / RATE_WINDOW
+        return (
+            self._previous_count * previous_share + self._window_count
+        ) / RATE_WINDOW
+
+    @property
+    def reconnects(self) -> int:
+        """Successful connections after the first one."""
+        return max(self.connects - 1, 0)
+
+    @property
+    def timeout_rate(self) -> float:
+        """Fraction of RPC requests that timed out."""
+        return self.rpc_timeouts / self.rpc_requests if self.rpc_requests else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "connect_failures": self.connect_failures,
+            "disconnects": self.disconnects,
+            "keepalive_failures": self.keepalive_failures,
+            "messages": self.messages,
+            "messages_per_second": round(self.messages_per_second, 2),
+            "notifications": self.notifications,
+            "notifications_ignored": self.notifications_ignored,
+            "rpc_requests": self.rpc_requests,
+            "rpc_shared": self.rpc_shared,
+            "rpc_failures": self.rpc_failures,
+            "rpc_timeouts": self.rpc_timeouts,
+            "rpc_timeout_rate": round(self.timeout_rate, 4),
+            "late_responses": self.late_responses,
+            "orphaned_responses": self.orphaned_responses,
+            "outbox_queued": self.outbox_queued,
+            "outbox_expired": self.outbox_expired,
+            "rpc_latency": self.rpc_latency.as_dict(),
+        }
+
+
+class CoordinatorMetrics:
+    """Counters kept by a ZaparooCoordinator."""
+
+    __slots__ = ("events", "events_unchanged", "listener_calls")
+
+    def __init__(self) -> None:
+        """Init all counters at zero."""
+        self.events = 0
+        self.events_unchanged = 0
+        self.listener_calls = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "events": self.events,
+            "events_unchanged": self.events_unchanged,
+            "listener_calls": self.listener_calls,
+        }
@@ -0,0 +1,207 @@
+"""Typed device state held by the coordinator."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Each model is parsed once from the notification or query result it came
+# from. Equality only looks at the typed fields, so an unchanged notification
+# is detected without comparing nested dicts. Alongside them each model keeps
+# its attributes: the top-level scalar fields of the params, copied once at
+# decode time. They are what entities expose, through the attribute policy,
+# and what is persisted; the raw params are not kept. Models are treated as
+# immutable but not frozen, since a frozen dataclass takes over twice as long
+# to construct, and are built positionally in from_params for the same reason.
+
+
+# Decoded JSON only holds these exact types, so a set lookup on type() is
+# enough, and much cheaper than isinstance.
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def scalar_attributes(params: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the top-level fields of params that are strings, numbers or None."""
+    if not params:
+        return {}
+    return {key: value for key, value in params.items() if type(value) in _SCALAR_TYPES}
+
+
+@dataclass(slots=True)
+class Media:
+    """Media running on the device."""
+
+    system_id: str | None
+    system_name: str | None
+    path: str | None
+    name: str | None
+    launcher_id: str | None = None
+    started: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_params(
+        cls, params: dict[str, Any], attributes: dict[str, Any] | None = None
+    ) -> Self:
+        """
+        Parse a media.started notification or active media entry.
+
+        attributes, if given, are the params' scalar_attributes, already
+        copied by the caller; the other models take them the same way.
+        """
+        return cls(
+            params.get("systemId"),
+            params.get("systemName"),
+            params.get("mediaPath"),
+            params.get("mediaName"),
+            params.get("launcherId"),
+            params.get("started"),
+            scalar_attributes(params) if attributes is None else attributes,
+        )
+
+
+@dataclass(slots=True)
+class Indexing:
+    """State of the device's media database."""
+
+    exists: bool
+    indexing: bool
+    total_files: int | None = None
+    total_steps: int | None = None
+    current_step: int | None = None
+    current_step_display: str | None = None
+    # Progress frames coalesced into this one; see IndexingCoalescer.
+    coalesced: int = field(default=0, compare=False)
+    attributes: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_params(
+        cls, params: dict[str, Any], attributes: dict[str, Any] | None = None
+    ) -> Self:
+        """Parse a media.indexing notification or media query database."""
+        return cls(
+            bool(params.get("exists", True)),
+            bool(params.get("indexing")),
+            params.get("totalFiles"),
+            params.get("totalSteps"),
+            params.get("currentStep"),
+            params.get("currentStepDisplay"),
+            params.get("coalesced") or 0,
+            scalar_attributes(params) if attributes is None else attributes,
+        )
+
+    def as_database(self) -> dict[str, Any]:
+        """Return the state in the shape of a media query's database."""
+        return {k: v for k, v in self.attributes.items() if k != "coalesced"}
+
+
+@dataclass(slots=True)
+class Reader:
+    """A token reader attached to the device."""
+
+    path: str
+    driver: str | None = None
+    connected: bool = True
+    id: str | None = None
+    info: str | None = None
+    capabilities: tuple[str, ...] = ()
+    attributes: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_params(
+        cls, params: dict[str, Any], attributes: dict[str, Any] | None = None
+    ) -> Self:
+        """Parse a readers.added notification or readers query entry."""
+        return cls(
+            params["path"],
+            params.get("driver"),
+            bool(params.get("connected", True)),
+            params.get("id"),
+            params.get("info"),
+            tuple(params.get("capabilities") or ()),
+            scalar_attributes(params) if attributes is None else attributes,
+        )
+
+    def as_params(self) -> dict[str, Any]:
+        """Return the reader in the shape of a readers query entry."""
+        return {**self.attributes, "capabilities": list(self.capabilities)}
+
+
+@dataclass(slots=True)
+class Token:
+    """The token last scanned on the device."""
+
+    type: str | None
+    uid: str | None
+    text: str | None
+    data: str | None
+    scan_time: str | None
+    attributes: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_params(
+        cls, params: dict[str, Any], attributes: dict[str, Any] | None = None
+    ) -> Self:
+        """Parse a tokens.added notification or tokens query's last token."""
+        return cls(
+            params.get("type"),
+            params.get("uid"),
+            params.get("text"),
+            params.get("data"),
+            params.get("scanTime"),
+            scalar_attributes(params) if attributes is None else attributes,
+        )
+
+
+@dataclass(slots=True)
+class Playtime:
+    """Play time limit state reported by the device."""
+
+    state: str | None = None
+    session_active: bool = False
+    limits_enabled: bool | None = None
+    session_started: str | None = None
+    session_duration: str | None = None
+    session_remaining: str | None = None
+    cooldown_remaining: str | None = None
+    # Set by the playtime.limit.* notifications.
+    reason: str | None = None
+    remaining: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_params(
+        cls, params: dict[str, Any], attributes: dict[str, Any] | None = None
+    ) -> Self:
+        """Parse a playtime query result or playtime.limit.* notification."""
+        return cls(
+            params.get("state"),
+            bool(params.get("sessionActive")),
+            params.get("limitsEnabled"),
+            params.get("sessionStarted"),
+            params.get("sessionDuration"),
+            params.get("sessionRemaining"),
+            params.get("cooldownRemaining"),
+            params.get("reason"),
+            params.get("remaining"),
+            scalar_attributes(params) if attributes is None else attributes,
+        )
+
+
+@dataclass(slots=True)
+class ZaparooState:
+    """Everything the coordinator knows about one device."""
+
+    media: Media | None = None
+    indexing: Indexing | None = None
+    readers: dict[str, Reader] = field(default_factory=dict)
+    last_token: Token | None = None
+    playtime: Playtime | None = None
+    connected: bool = False
+    # The last notification and its scalar_attributes, for the event entity
+    # and sensor.
+    last_event_method: str | None = None
+    last_event_attributes: dict[str, Any] | None = None
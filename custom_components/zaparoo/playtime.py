@@ -0,0 +1,277 @@
+"""Per-game play time, rolled up by day and kept under .storage."""
+
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import (
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    PLAYTIME_RETENTION_DAYS,
+    SLICE_CONNECTION,
+    SLICE_MEDIA,
+    SLICE_RESYNC,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ZaparooCoordinator
+    from .models import Media
+
+STORAGE_VERSION = 1
+# A running session is saved this often, so a crash loses at most this much.
+SAVE_DELAY = 60
+
+# (system ID, media name)
+type GameKey = tuple[str, str]
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.playtime"
+
+
+def _game_key(media: Media | None) -> GameKey | None:
+    if media is None:
+        return None
+    system = media.system_id or media.system_name or ""
+    name = media.name or media.path or ""
+    return (system, name) if system or name else None
+
+
+def _split_by_day(start: float, end: float) -> Iterator[tuple[date, float]]:
+    """Yield the local days between two timestamps and the seconds in each."""
+    while start < end:
+        day = dt_util.as_local(dt_util.utc_from_timestamp(start)).date()
+        midnight = dt_util.start_of_local_day(day + timedelta(days=1)).timestamp()
+        chunk_end = min(end, midnight)
+        yield day, chunk_end - start
+        start = chunk_end
+
+
+class PlaytimeLedger:
+    """
+    Running play time per game, system and day for one device.
+
+    A game counts as played while the device is connected and reports it as
+    the active media, as long as media notifications aren't filtered out in
+    the options. The running session is folded into the day totals each time
+    it ends, splitting it at local midnight, so reading a total is a lookup
+    rather than a scan of the media sensor's history. While it runs it is
+    added to what is saved every SAVE_DELAY seconds, so a crash only loses
+    the time since. Days past the retention period are dropped on load and
+    at each local midnight. Time while the device is unreachable or Home
+    Assistant isn't running is not counted.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, coordinator: ZaparooCoordinator
+    ) -> None:
+        """Init an empty ledger."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        # day -> system ID -> media name -> seconds
+        self._days: dict[date, dict[str, dict[str, float]]] = {}
+        # day -> seconds, kept alongside so totals are O(1)
+        self._totals: dict[date, float] = {}
+        self._game: GameKey | None = None
+        self._started_at = 0.0
+
+    @property
+    def game(self) -> GameKey | None:
+        """The game being timed, if any."""
+        return self._game
+
+    async def async_load(self) -> None:
+        """Read the saved rollups."""
+        data = await self._store.async_load() or {}
+        for day_str, systems in (data.get("days") or {}).items():
+            if (day := dt_util.parse_date(day_str)) is None:
+                continue
+            self._days[day] = {
+                system: {name: float(seconds) for name, seconds in games.items()}
+                for system, games in systems.items()
+            }
+            self._totals[day] = sum(
+                sum(games.values()) for games in self._days[day].values()
+            )
+        self._prune()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        # The running session is included, but stays running.
+        return {
+            "days": {
+                day.isoformat(): {
+                    system: {name: round(seconds) for name, seconds in games.items()}
+                    for system, games in systems.items()
+                }
+                for day, systems in self._rollups().items()
+            }
+        }
+
+    async def async_save(self) -> None:
+        """Close the running session and write the ledger now."""
+        self._async_end_session(time.time())
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Time play as the device reports it; returns a stop callback."""
+        self._async_update()
+        remove_listener = self.coordinator.async_add_listener(
+            self._async_update,
+            frozenset({SLICE_MEDIA, SLICE_CONNECTION, SLICE_RESYNC}),
+        )
+        remove_checkpoint = async_track_time_interval(
+            self.hass, self._async_checkpoint, timedelta(seconds=SAVE_DELAY)
+        )
+        remove_new_day = async_track_time_change(
+            self.hass, self._async_new_day, hour=0, minute=0, second=0
+        )
+
+        @callback
+        def stop() -> None:
+            remove_listener()
+            remove_checkpoint()
+            remove_new_day()
+
+        return stop
+
+    @callback
+    def _async_checkpoint(self, _now: datetime) -> None:
+        if self._game is not None:
+            self._store.async_delay_save(self._data_to_save)
+
+    @callback
+    def _async_new_day(self, _now: datetime) -> None:
+        if self._prune():
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_update(self) -> None:
+        coordinator = self.coordinator
+        # Only media the device has confirmed since connecting counts; restored
+        # or pre-disconnect media may have stopped long ago, and without media
+        # notifications a game stopping would go unnoticed.
+        confirmed = (
+            coordinator.data.connected
+            and coordinator.media_synced_at is not None
+            and coordinator.media_pushed
+        )
+        game = _game_key(coordinator.data.media) if confirmed else None
+        if game == self._game:
+            return
+
+        now = time.time()
+        self._async_end_session(now)
+        if game is not None:
+            self._game = game
+            self._started_at = now
+
+    @callback
+    def _async_end_session(self, now: float) -> None:
+        if self._game is None:
+            return
+        system, name = self._game
+        for day, seconds in _split_by_day(self._started_at, now):
+            games = self._days.setdefault(day, {}).setdefault(system, {})
+            games[name] = games.get(name, 0.0) + seconds
+            self._totals[day] = self._totals.get(day, 0.0) + seconds
+        self._game = None
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _prune(self) -> bool:
+        """Drop days past the retention period; returns whether any were."""
+        oldest = dt_util.now().date() - timedelta(days=PLAYTIME_RETENTION_DAYS)
+        expired = [day for day in self._days if day < oldest]
+        for day in expired:
+            del self._days[day]
+            self._totals.pop(day, None)
+        return bool(expired)
+
+    def _rollups(
+        self, start: date = date.min, end: date = date.max
+    ) -> dict[date, dict[str, dict[str, float]]]:
+        """Return a copy of the days from start to end, with the running session."""
+        days = {
+            day: {system: dict(games) for system, games in systems.items()}
+            for day, systems in self._days.items()
+            if start <= day <= end
+        }
+        # Read once: saves call this from the executor.
+        game, started_at = self._game, self._started_at
+        if game is not None:
+            system, name = game
+            for day, seconds in _split_by_day(started_at, time.time()):
+                if start <= day <= end:
+                    games = days.setdefault(day, {}).setdefault(system, {})
+                    games[name] = games.get(name, 0.0) + seconds
+        return days
+
+    def _running(self, since: datetime) -> float:
+        """Seconds of the running session after since."""
+        if self._game is None:
+            return 0.0
+        return max(0.0, time.time() - max(self._started_at, since.timestamp()))
+
+    def today(self) -> float:
+        """Seconds played today, including the running session."""
+        today = dt_util.start_of_local_day()
+        return self._totals.get(today.date(), 0.0) + self._running(today)
+
+    def this_week(self) -> float:
+        """Seconds played since Monday, including the running session."""
+        today = dt_util.now().date()
+        monday = today - timedelta(days=today.weekday())
+        played = sum(
+            self._totals.get(monday + timedelta(days=offset), 0.0)
+            for offset in range(today.weekday() + 1)
+        )
+        return played + self._running(dt_util.start_of_local_day(monday))
+
+    def report(self, start: date, end: date) -> dict[str, Any]:
+        """Return the daily rollups from start to end, both inclusive."""
+        days = self._rollups(start, end)
+        report_days = []
+        for day in sorted(days):
+            systems = {
+                system: round(sum(games.values()))
+                for system, games in days[day].items()
+            }
+            report_days.append(
+                {
+                    "date": day.isoformat(),
+                    "total": sum(systems.values()),
+                    "systems": systems,
+                    "titles": [
+                        {"system": system, "name": name, "seconds": round(seconds)}
+                        for system, games in days[day].items()
+                        for name, seconds in sorted(
+                            games.items(), key=lambda item: -item[1]
+                        )
+                    ],
+                }
+            )
+        return {
+            "days": report_days,
+            "total": sum(day["total"] for day in report_days),
+        }
+
+
+async def async_remove_playtime(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the play time of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
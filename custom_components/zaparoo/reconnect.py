@@ -0,0 +1,98 @@
+"""Reconnect policy and connect supervisor for Zaparoo WebSockets."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from homeassistant.core import HomeAssistant
+
+DATA_CONNECT_SUPERVISOR: HassKey[ConnectSupervisor] = HassKey(
+    f"{DOMAIN}_connect_supervisor"
+)
+
+# Reconnect delays grow as BASE * 2**attempt up to CAP, with full jitter.
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 300.0
+# A connection that stayed up this long resets the backoff.
+STABLE_CONNECTION_TIME = 60.0
+
+# Connect attempts across all entries: at most this many handshakes at once,
+# started at least CONNECT_SPACING seconds apart.
+MAX_CONCURRENT_CONNECTS = 4
+CONNECT_SPACING = 0.25
+
+
+class ReconnectBackoff:
+    """Exponential backoff with full jitter and a cap."""
+
+    def __init__(
+        self,
+        base: float = RECONNECT_BASE_DELAY,
+        cap: float = RECONNECT_MAX_DELAY,
+    ) -> None:
+        """Init the backoff."""
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+
+    def next_delay(self) -> float:
+        """Return the delay before the next attempt and advance the backoff."""
+        ceiling = min(self.cap, self.base * 2**self.attempt)
+        if ceiling < self.cap:
+            self.attempt += 1
+        return random.uniform(0, ceiling)  # noqa: S311 Not used for crypto
+
+    def reset(self) -> None:
+        """Start over from the base delay."""
+        self.attempt = 0
+
+
+@callback
+def async_get_connect_supervisor(hass: HomeAssistant) -> ConnectSupervisor:
+    """Return the supervisor shared by all entries, creating it on first use."""
+    if (supervisor := hass.data.get(DATA_CONNECT_SUPERVISOR)) is None:
+        supervisor = hass.data[DATA_CONNECT_SUPERVISOR] = ConnectSupervisor()
+    return supervisor
+
+
+class ConnectSupervisor:
+    """
+    Stagger connection attempts across all Zaparoo devices.
+
+    Limits how many handshakes run at once and spaces their start, so a
+    restart with many configured devices ramps up instead of connecting all
+    of them in the same instant.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_CONNECTS,
+        spacing: float = CONNECT_SPACING,
+    ) -> None:
+        """Init the supervisor."""
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._spacing = spacing
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a connect slot for the duration of one handshake."""
+        async with self._semaphore:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._spacing
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
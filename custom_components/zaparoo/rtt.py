@@ -0,0 +1,60 @@
+"""Round-trip time estimation for a Zaparoo connection."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# RFC 6298 smoothing gains and retransmission timeout bounds. The lower bound
+# is well above a LAN round trip so scheduling jitter on a busy Home Assistant
+# host isn't mistaken for a dead link.
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+RTO_K = 4
+RTO_INITIAL = 3.0
+RTO_MIN = 1.0
+RTO_MAX = 10.0
+
+
+class RttEstimator:
+    """Smoothed RTT and variance, with a timeout derived from them."""
+
+    __slots__ = ("last", "rttvar", "samples", "srtt")
+
+    def __init__(self) -> None:
+        """Init with no samples."""
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.last: float | None = None
+        self.samples = 0
+
+    def observe(self, rtt: float) -> None:
+        """Fold in one round-trip time measurement, in seconds."""
+        self.last = rtt
+        self.samples += 1
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+            return
+        self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+        self.srtt += RTT_ALPHA * (rtt - self.srtt)
+
+    @property
+    def rto(self) -> float:
+        """How long to wait for an answer before giving up on the link."""
+        if self.srtt is None or self.rttvar is None:
+            return RTO_INITIAL
+        return min(max(self.srtt + RTO_K * self.rttvar, RTO_MIN), RTO_MAX)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimate in milliseconds for diagnostics."""
+
+        def _ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "samples": self.samples,
+            "last_ms": _ms(self.last),
+            "srtt_ms": _ms(self.srtt),
+            "rttvar_ms": _ms(self.rttvar),
+            "rto_ms": _ms(self.rto),
+        }
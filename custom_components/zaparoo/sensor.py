@@ -3,23 +3,154 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from custom_components.zaparoo.const import DOMAIN
-from custom_components.zaparoo.coordinator import ZaparooCoordinator
+from custom_components.zaparoo.attributes import (
+    MEDIA_ATTRIBUTES,
+    READER_ATTRIBUTES,
+    VOLATILE_ATTRIBUTES,
+)
+from custom_components.zaparoo.const import (
+    DOMAIN,
+    SLICE_CONNECTION,
+    SLICE_EVENT,
+    SLICE_MEDIA,
+    SLICE_READERS,
+)
+from custom_components.zaparoo.coordinator import ZaparooCoordinator, reader_slice
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
-    from custom_components.zaparoo.data import ZaparooDataConfigEntry
+    from custom_components.zaparoo.data import ZaparooData, ZaparooDataConfigEntry
+    from custom_components.zaparoo.models import Reader
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the metric and play time sensors poll; everything else is pushed by the
+# coordinator.
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ZaparooPolledSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor that polls the entry's runtime data."""
+
+    value_fn: Callable[[ZaparooData], StateType]
+
+
+def _srtt_ms(data: ZaparooData) -> float | None:
+    """Return the smoothed ping RTT while connected."""
+    srtt = data.client.rtt.srtt
+    if srtt is None or not data.coordinator.data.connected:
+        return None
+    return srtt * 1000
+
+
+METRIC_SENSORS: tuple[ZaparooPolledSensorEntityDescription, ...] = (
+    ZaparooPolledSensorEntityDescription(
+        key="latency",
+        name="Latency",
+        icon="mdi:lan-pending",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_srtt_ms,
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        icon="mdi:connection",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.client.metrics.reconnects,
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="messages_per_second",
+        name="Messages Per Second",
+        icon="mdi:swap-vertical",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.client.metrics.messages_per_second,
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="pending_requests",
+        name="Pending Requests",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.client.pending_requests,
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="rpc_latency_p95",
+        name="RPC Latency p95",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.client.metrics.rpc_latency.quantile(0.95),
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="rpc_timeout_rate",
+        name="RPC Timeout Rate",
+        icon="mdi:timer-alert-outline",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.client.metrics.timeout_rate * 100,
+    ),
+)
+
+PLAYTIME_SENSORS: tuple[ZaparooPolledSensorEntityDescription, ...] = (
+    ZaparooPolledSensorEntityDescription(
+        key="playtime_today",
+        name="Playtime Today",
+        icon="mdi:timer-play-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+        value_fn=lambda data: round(data.playtime.today() / 60, 1),
+    ),
+    ZaparooPolledSensorEntityDescription(
+        key="playtime_week",
+        name="Playtime This Week",
+        icon="mdi:calendar-clock",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+        value_fn=lambda data: round(data.playtime.this_week() / 60, 1),
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Reqired
@@ -34,15 +165,42 @@ async def async_setup_entry(
             ZaparooNotificationSensor(entry, coordinator, host),
             ZaparooConnectedSensor(entry, coordinator, host),
             ZaparooMediaSensor(entry, coordinator, host),
+            *(
+                ZaparooPolledSensor(entry, description, host)
+                for description in (*METRIC_SENSORS, *PLAYTIME_SENSORS)
+            ),
         ]
     )
 
+    # Reader sensors come and go with the readers. Each one removes itself
+    # when its reader is removed; this only adds sensors for new readers.
+    known_paths: set[str] = set()
+
+    @callback
+    def _async_add_new_readers() -> None:
+        paths = coordinator.data.readers.keys()
+        known_paths.intersection_update(paths)
+        if new_paths := paths - known_paths:
+            known_paths.update(new_paths)
+            add_entities(
+                ZaparooReaderSensor(entry, coordinator, host, path)
+                for path in sorted(new_paths)
+            )
+
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            _async_add_new_readers, frozenset({SLICE_READERS})
+        )
+    )
+    _async_add_new_readers()
+
 
 class ZaparooNotificationSensor(CoordinatorEntity, SensorEntity):
     """Sensor that displays the most recent Zaparoo notification."""
 
     _attr_icon = "mdi:satellite-uplink"
     _attr_native_unit_of_measurement = None
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
 
     def __init__(
         self,
@@ -51,7 +209,7 @@ class ZaparooNotificationSensor(CoordinatorEntity, SensorEntity):
         host: str,
     ) -> None:
         """Init the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({SLICE_EVENT}))
 
         self.entry = entry
         self._attr_unique_id = f"{entry.entry_id}_events"
@@ -65,12 +223,14 @@ class ZaparooNotificationSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self) -> str:
         """Display the last notification type (e.g., 'media.started')."""
-        return str(self.coordinator.data.get("last_notification_method"))
+        return str(self.coordinator.data.last_event_method)
 
     @property
     def extra_state_attributes(self) -> Any:
         """Expose event parameters."""
-        return self.coordinator.data.get("last_notification_params") or {}
+        return self.entry.runtime_data.attribute_policy.apply(
+            self.coordinator.data.last_event_attributes
+        )
 
 
 class ZaparooConnectedSensor(CoordinatorEntity, SensorEntity):
@@ -85,7 +245,7 @@ class ZaparooConnectedSensor(CoordinatorEntity, SensorEntity):
         coordinator: ZaparooCoordinator,
         host: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({SLICE_CONNECTION}))
 
         self.entry = entry
         self._attr_unique_id = f"{entry.entry_id}_connected"
@@ -99,7 +259,7 @@ class ZaparooConnectedSensor(CoordinatorEntity, SensorEntity):
     @property
     def state(self) -> bool:
         """Display the last event type (e.g., 'media.started')."""
-        return bool(self.coordinator.data.get("connected"))
+        return self.coordinator.data.connected
 
 
 class ZaparooMediaSensor(CoordinatorEntity[ZaparooCoordinator], SensorEntity):
@@ -108,12 +268,13 @@ class ZaparooMediaSensor(CoordinatorEntity[ZaparooCoordinator], SensorEntity):
     _attr_has_entity_name = True
     _attr_name = "Media"
     _attr_icon = "mdi:gamepad-variant"
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
 
     def __init__(
         self, entry: ZaparooDataConfigEntry, coordinator: ZaparooCoordinator, host: str
     ) -> None:
         """Initialize the Zaparoo media sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({SLICE_MEDIA}))
 
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_media"
@@ -127,16 +288,109 @@ class ZaparooMediaSensor(CoordinatorEntity[ZaparooCoordinator], SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the media name currently playing."""
-        media = self.coordinator.data.get("media")
-        if not media:
+        media = self.coordinator.data.media
+        return media.name if media is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the media's identifying fields."""
+        media = self.coordinator.data.media
+        if media is None:
+            return None
+        policy = self._entry.runtime_data.attribute_policy
+        return policy.apply(media.attributes, MEDIA_ATTRIBUTES)
+
+
+class ZaparooReaderSensor(CoordinatorEntity[ZaparooCoordinator], SensorEntity):
+    """Sensor for one reader, updated only when that reader changes."""
+
+    _attr_icon = "mdi:nfc-variant"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["connected", "disconnected"]  # noqa: RUF012
+
+    def __init__(
+        self,
+        entry: ZaparooDataConfigEntry,
+        coordinator: ZaparooCoordinator,
+        host: str,
+        path: str,
+    ) -> None:
+        """Init the sensor for the reader at path."""
+        super().__init__(coordinator, context=frozenset({reader_slice(path)}))
+
+        self.path = path
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_reader_{path}"
+        self._attr_name = f"Zaparoo Reader {path} ({host})"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Zaparoo",
+            manufacturer="Zaparoo",
+        )
+
+    @property
+    def _reader(self) -> Reader | None:
+        return self.coordinator.data.readers.get(self.path)
+
+    @property
+    def native_value(self) -> str | None:
+        """Return whether the reader is connected."""
+        if (reader := self._reader) is None:
             return None
-        return media.get("mediaName")
+        return "connected" if reader.connected else "disconnected"
 
     @property
-    def extra_state_attributes(self) -> dict[str, str] | None:
-        """Return the full state of media."""
-        media = self.coordinator.data.get("media")
-        if not media:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the reader as reported by the device."""
+        if (reader := self._reader) is None:
             return None
+        policy = self._entry.runtime_data.attribute_policy
+        return policy.apply(reader.attributes, READER_ATTRIBUTES)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the reader, unless it was removed in the meantime."""
+        await super().async_added_to_hass()
+        if self._reader is None:
+            self._async_remove_reader()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._reader is None:
+            self._async_remove_reader()
+            return
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_remove_reader(self) -> None:
+        """Delete this sensor, which removes it from Home Assistant too."""
+        er.async_get(self.hass).async_remove(self.entity_id)
+
+
+class ZaparooPolledSensor(SensorEntity):
+    """Sensor that polls a metric or total from the entry's runtime data."""
+
+    entity_description: ZaparooPolledSensorEntityDescription
 
-        return media
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        entry: ZaparooDataConfigEntry,
+        description: ZaparooPolledSensorEntityDescription,
+        host: str,
+    ) -> None:
+        """Init the sensor."""
+        self.entity_description = description
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_name = f"Zaparoo {description.name} ({host})"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Zaparoo",
+            manufacturer="Zaparoo",
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Read the value from the entry's runtime data."""
+        return self.entity_description.value_fn(self.entry.runtime_data)
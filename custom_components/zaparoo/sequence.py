@@ -0,0 +1,196 @@
+"""Per-device queue of launch sequences run by zaparoo.launch_sequence."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.ulid import ulid_now
+
+from .const import SLICE_EVENT
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ZaparooCoordinator
+    from .websocket_client import ZaparooWebSocket
+
+_LOGGER = logging.getLogger(__name__)
+
+# Progress events fired through the event entity.
+SEQUENCE_STARTED = "sequence.started"
+SEQUENCE_STEP = "sequence.step"
+SEQUENCE_FINISHED = "sequence.finished"
+SEQUENCE_CANCELLED = "sequence.cancelled"
+SEQUENCE_FAILED = "sequence.failed"
+
+
+@dataclass
+class LaunchStep:
+    """One token of a launch sequence."""
+
+    # run params: type/text/data/unsafe
+    params: dict[str, Any]
+    # Seconds to wait after this step before running the next one.
+    delay: float = 0.0
+    # Wait for the device to report media.started before continuing.
+    wait_for_media: bool = False
+
+
+@dataclass
+class LaunchJob:
+    """A queued launch sequence."""
+
+    sequence_id: str
+    steps: list[LaunchStep]
+    media_timeout: float
+
+
+class LaunchSequencer:
+    """
+    Runs launch sequences for one device, one at a time in FIFO order.
+
+    Each launch replaces the one before it on the device, so steps are sent
+    one at a time, each after the device has answered the previous one.
+    Sequences queue behind the running one, so a new one can be enqueued
+    without waiting for it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: ZaparooWebSocket,
+        coordinator: ZaparooCoordinator,
+    ) -> None:
+        """Init an idle sequencer."""
+        self.hass = hass
+        self.client = client
+        self.coordinator = coordinator
+        self._jobs: deque[LaunchJob] = deque()
+        self._task: asyncio.Task[None] | None = None
+        self._current: LaunchJob | None = None
+
+    @property
+    def pending(self) -> int:
+        """Sequences running or waiting to run."""
+        return len(self._jobs) + (self._current is not None)
+
+    @callback
+    def async_enqueue(self, steps: list[LaunchStep], media_timeout: float) -> str:
+        """Queue a sequence to run after any already queued; returns its ID."""
+        job = LaunchJob(ulid_now(), steps, media_timeout)
+        self._jobs.append(job)
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run_jobs(), "zaparoo launch sequence"
+            )
+        return job.sequence_id
+
+    @callback
+    def async_cancel(self) -> int:
+        """Cancel the running sequence and drop queued ones; returns how many."""
+        cancelled = self.pending
+        for job in self._jobs:
+            self._emit(SEQUENCE_CANCELLED, job, step=0)
+        self._jobs.clear()
+        self._current = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        return cancelled
+
+    async def _async_run_jobs(self) -> None:
+        try:
+            while self._jobs:
+                self._current = self._jobs.popleft()
+                await self._async_run_job(self._current)
+        finally:
+            # Unless cancelled, in which case a new task may already own these.
+            if self._task is asyncio.current_task():
+                self._task = None
+                self._current = None
+
+    async def _async_run_job(self, job: LaunchJob) -> None:
+        """Run every step of a sequence, reporting progress as events."""
+        self._emit(SEQUENCE_STARTED, job, step=0)
+        done = current = 0
+        try:
+            for number, step in enumerate(job.steps, start=1):
+                current = number
+                media_started = self._watch_media() if step.wait_for_media else None
+                try:
+                    await self._async_send_step(step)
+                    done = number
+                    self._emit(
+                        SEQUENCE_STEP, job, step=number, text=step.params.get("text")
+                    )
+                    if media_started is not None:
+                        await self._async_wait_media(media_started, job.media_timeout)
+                finally:
+                    if media_started is not None:
+                        media_started.cancel()
+                if step.delay and number < len(job.steps):
+                    await asyncio.sleep(step.delay)
+        except asyncio.CancelledError:
+            self._emit(SEQUENCE_CANCELLED, job, step=done)
+            raise
+        except HomeAssistantError as err:
+            _LOGGER.warning("Zaparoo launch sequence failed: %s", err)
+            # The step being run: rejected, or its media never started.
+            self._emit(SEQUENCE_FAILED, job, step=current, error=str(err))
+            return
+
+        self._emit(SEQUENCE_FINISHED, job, step=done)
+
+    async def _async_send_step(self, step: LaunchStep) -> None:
+        """Send one run request and wait for the device to accept it."""
+        try:
+            response = await self.client.send_jsonrpc("run", step.params)
+        except HomeAssistantError:
+            raise
+        except Exception as err:
+            raise HomeAssistantError(str(err)) from err
+        if isinstance(response, dict) and "error" in response:
+            raise HomeAssistantError(response["error"])
+
+    def _watch_media(self) -> asyncio.Future[None]:
+        """Return a future resolved by the next media.started notification."""
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        coordinator = self.coordinator
+
+        @callback
+        def _on_event() -> None:
+            method = coordinator.data.last_event_method
+            if method == "media.started" and not future.done():
+                future.set_result(None)
+
+        remove = coordinator.async_add_listener(_on_event, frozenset({SLICE_EVENT}))
+        future.add_done_callback(lambda _: remove())
+        return future
+
+    @staticmethod
+    async def _async_wait_media(
+        future: asyncio.Future[None], media_timeout: float
+    ) -> None:
+        try:
+            async with asyncio.timeout(media_timeout):
+                await future
+        except TimeoutError as err:
+            msg = f"Media did not start within {media_timeout:g}s"
+            raise HomeAssistantError(msg) from err
+
+    def _emit(self, method: str, job: LaunchJob, step: int, **extra: Any) -> None:
+        self.coordinator.emit_event(
+            method,
+            {
+                "sequence_id": job.sequence_id,
+                "step": step,
+                "total": len(job.steps),
+                **extra,
+            },
+        )
@@ -2,39 +2,179 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, cast
+import asyncio
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant.core import SupportsResponse
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import device_registry as dr
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_HISTORY_LIMIT,
+    DEFAULT_MEDIA_MAX_AGE,
+    DEFAULT_OUTBOX_TIMEOUT,
+    DEFAULT_PLAYTIME_DAYS,
+    DEFAULT_SEQUENCE_MEDIA_TIMEOUT,
+    DEFAULT_TITLE_MATCHES,
+    DOMAIN,
+    MAX_SEQUENCE_STEPS,
+    MIN_TITLE_SCORE,
+    PLAYTIME_RETENTION_DAYS,
+)
+from .device_index import async_get_device_index
+from .sequence import LaunchStep
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant, ServiceCall
+    from collections.abc import Awaitable, Callable
+    from datetime import date
 
-    from custom_components.zaparoo.data import ZaparooDataConfigEntry
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
 
+    from .data import ZaparooData
+    from .titles import TitleMatch
     from .websocket_client import ZaparooWebSocket
 
 SERVICE_LAUNCH = "launch"
 SERVICE_STOP = "stop"
 SERVICE_MEDIA = "media"
+SERVICE_SEARCH = "search"
+SERVICE_HISTORY = "history"
+SERVICE_LAUNCH_SEQUENCE = "launch_sequence"
+SERVICE_RESOLVE_TITLE = "resolve_title"
+SERVICE_PLAYTIME_REPORT = "playtime_report"
+
+# Upper bound on devices a single launch/stop call talks to at once.
+MAX_CONCURRENT_DEVICES = 8
+
+WHEN_DISCONNECTED_QUEUE = "queue"
+WHEN_DISCONNECTED_FAIL = "fail"
+
+# How launch/stop behave while a device is briefly disconnected.
+OUTBOX_FIELDS = {
+    vol.Optional("when_disconnected", default=WHEN_DISCONNECTED_FAIL): vol.In(
+        [WHEN_DISCONNECTED_QUEUE, WHEN_DISCONNECTED_FAIL]
+    ),
+    vol.Optional("queue_timeout", default=DEFAULT_OUTBOX_TIMEOUT): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+}
 
 LAUNCH_SCHEMA = vol.Schema(
     {
         vol.Optional("type"): str,
-        vol.Optional("text"): str,
+        vol.Exclusive("text", "zapscript"): str,
+        vol.Exclusive("title", "zapscript"): str,
+        vol.Optional("systems"): vol.All(cv.ensure_list, [str]),
         vol.Optional("data"): str,
         vol.Optional("unsafe", default=False): bool,
+        **OUTBOX_FIELDS,
         vol.Optional("device_id"): object,
         vol.Optional("area_id"): object,
     }
 )
 
-NO_BODY_SCHEMA = vol.Schema(
+STOP_SCHEMA = vol.Schema(
+    {
+        **OUTBOX_FIELDS,
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+RUN_PARAMS = ("type", "text", "data", "unsafe")
+
+
+def _has_text_or_data(step: dict[str, Any]) -> dict[str, Any]:
+    if not any(step.get(k) for k in ("text", "data")):
+        msg = "One of 'text' or 'data' is required"
+        raise vol.Invalid(msg)
+    return step
+
+
+SEQUENCE_STEP_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("type"): str,
+            vol.Optional("text"): str,
+            vol.Optional("data"): str,
+            vol.Optional("unsafe"): bool,
+            vol.Optional("delay", default=0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Optional("wait_for_media", default=False): bool,
+        }
+    ),
+    _has_text_or_data,
+)
+
+LAUNCH_SEQUENCE_SCHEMA = vol.Schema(
     {
+        vol.Required("steps"): vol.All(
+            cv.ensure_list,
+            [SEQUENCE_STEP_SCHEMA],
+            vol.Length(min=1, max=MAX_SEQUENCE_STEPS),
+        ),
+        vol.Optional("media_timeout", default=DEFAULT_SEQUENCE_MEDIA_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Required("query"): str,
+        vol.Optional("systems"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("max_results"): vol.All(int, vol.Range(min=1)),
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+RESOLVE_TITLE_SCHEMA = vol.Schema(
+    {
+        vol.Required("title"): str,
+        vol.Optional("systems"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("limit", default=DEFAULT_TITLE_MATCHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+MEDIA_SCHEMA = vol.Schema(
+    {
+        vol.Optional("force_refresh", default=False): bool,
+        vol.Optional("max_age", default=DEFAULT_MEDIA_MAX_AGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("method"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("limit", default=DEFAULT_HISTORY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional("device_id"): object,
+        vol.Optional("area_id"): object,
+    }
+)
+
+PLAYTIME_REPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional("start"): cv.date,
+        vol.Optional("end"): cv.date,
         vol.Optional("device_id"): object,
         vol.Optional("area_id"): object,
     }
@@ -42,26 +182,40 @@ NO_BODY_SCHEMA = vol.Schema(
 
 
 def _device_ids_from_target(call: ServiceCall) -> list[str]:
-    """Extract device IDs from HA service call."""
-    device_ids = call.data.get("device_id")
+    """Extract device IDs from HA service call, expanding any areas."""
+    device_ids = _as_id_list(call.data.get("device_id"), "device_id")
+
+    if area_ids := _as_id_list(call.data.get("area_id"), "area_id"):
+        index = async_get_device_index(call.hass)
+        for area_id in area_ids:
+            device_ids.extend(index.async_device_ids_for_area(area_id))
+
     if not device_ids:
         msg = "No target devices specified"
         raise HomeAssistantError(msg)
-    if isinstance(device_ids, str):
-        return [device_ids]
-    if isinstance(device_ids, list):
-        return device_ids
-    msg = "Invalid device_id type"
+
+    # Deduplicate, keeping the order targets were given in.
+    return list(dict.fromkeys(device_ids))
+
+
+def _as_id_list(ids: Any, field: str) -> list[str]:
+    """Normalise a single ID or list of IDs from a service target."""
+    if not ids:
+        return []
+    if isinstance(ids, str):
+        return [ids]
+    if isinstance(ids, list):
+        return list(ids)
+    msg = f"Invalid {field} type"
     raise HomeAssistantError(msg)
 
 
-async def async_launch_service(call: ServiceCall) -> None:
+async def async_launch_service(call: ServiceCall) -> ServiceResponse:
     """Call to launch a token."""
-    hass = call.hass
     device_ids = _device_ids_from_target(call)
 
-    if not any(call.data.get(k) for k in ("text", "data")):
-        msg = "One of 'text' or 'data' is required"
+    if not any(call.data.get(k) for k in ("text", "data", "title")):
+        msg = "One of 'text', 'data' or 'title' is required"
         raise HomeAssistantError(msg)
 
     params = {
@@ -75,56 +229,247 @@ async def async_launch_service(call: ServiceCall) -> None:
         if v is not None
     }
 
-    for device_id in device_ids:
-        ws = _get_ws_for_device(hass, device_id)
+    if title := call.data.get("title"):
+        responses = await _async_launch_title(
+            call, device_ids, title, params, _outbox_timeout(call)
+        )
+    else:
+        responses = await _async_fan_out(
+            call.hass, device_ids, "run", params, _outbox_timeout(call)
+        )
+    if call.return_response:
+        return responses
+    _raise_for_errors(responses, "Launch")
+    return None
+
+
+async def _async_launch_title(
+    call: ServiceCall,
+    device_ids: list[str],
+    title: str,
+    params: dict[str, Any],
+    outbox_timeout: float | None,
+) -> dict[str, Any]:
+    """Launch the best match for a title on each device, from its library."""
+    systems: list[str] = call.data.get("systems") or []
+    found, failed = _resolve_devices(call.hass, device_ids)
+    results = await asyncio.gather(
+        *(_async_resolve_title(data, title, systems, 1) for data in found.values()),
+        return_exceptions=True,
+    )
 
-        try:
-            response = await ws.send_jsonrpc("run", params)
-        except Exception as err:
-            msg = f"Launch failed: {err}"
-            raise HomeAssistantError(msg) from err
+    device_params: dict[str, Any] = {}
+    for device_id, matches in zip(found, results, strict=True):
+        if isinstance(matches, Exception):
+            failed[device_id] = {"success": False, "error": str(matches)}
+        elif isinstance(matches, BaseException):
+            raise matches
+        elif matches:
+            device_params[device_id] = {**params, "text": matches[0].zapscript}
+        else:
+            failed[device_id] = {
+                "success": False,
+                "error": f"No media matching '{title}'",
+            }
+
+    responses = await _async_fan_out(
+        call.hass,
+        list(device_params),
+        "run",
+        outbox_timeout=outbox_timeout,
+        device_params=device_params,
+    )
+    responses.update(failed)
+    return {device_id: responses[device_id] for device_id in device_ids}
 
-        if isinstance(response, dict) and "error" in response:
-            raise HomeAssistantError(response["error"])
 
-        result = response.get("result") if isinstance(response, dict) else None
-        if result not in (None, {}, []):
-            msg = "Non-empty result from Zaparoo run(): %s"
-            raise HomeAssistantError(msg, result)
+async def _async_resolve_title(
+    data: ZaparooData, title: str, systems: list[str], limit: int
+) -> list[TitleMatch]:
+    """Return the device's titles most like title, best first."""
+    title_index = await data.library.async_get_title_index()
+    return title_index.search(title, systems, limit, MIN_TITLE_SCORE)
+
 
+async def async_launch_sequence_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to queue a sequence of tokens on each target device.
 
-async def async_stop_service(call: ServiceCall) -> None:
-    """Call to stop the current running game."""
-    hass = call.hass
+    Returns as soon as the sequences are queued; progress is reported through
+    the event entity and zaparoo.stop cancels them.
+    """
     device_ids = _device_ids_from_target(call)
+    index = async_get_device_index(call.hass)
+    steps = [
+        LaunchStep(
+            params={k: step[k] for k in RUN_PARAMS if k in step},
+            delay=step["delay"],
+            wait_for_media=step["wait_for_media"],
+        )
+        for step in call.data["steps"]
+    ]
+
+    sequencers = [index.async_get_data(device_id).sequencer for device_id in device_ids]
+    sequence_ids = {
+        device_id: sequencer.async_enqueue(steps, call.data["media_timeout"])
+        for device_id, sequencer in zip(device_ids, sequencers, strict=True)
+    }
+    if call.return_response:
+        return {"sequences": sequence_ids}
+    return None
 
-    for device_id in device_ids:
-        ws = _get_ws_for_device(hass, device_id)
 
+async def async_stop_service(call: ServiceCall) -> ServiceResponse:
+    """Call to stop the current running game and any launch sequence."""
+    device_ids = _device_ids_from_target(call)
+    found, not_found = _resolve_devices(call.hass, device_ids)
+    for data in found.values():
+        data.sequencer.async_cancel()
+
+    responses = await _async_fan_out(
+        call.hass, list(found), "stop", outbox_timeout=_outbox_timeout(call)
+    )
+    responses.update(not_found)
+    responses = {device_id: responses[device_id] for device_id in device_ids}
+    if call.return_response:
+        return responses
+    _raise_for_errors(responses, "Stop")
+    return None
+
+
+def _resolve_devices(
+    hass: HomeAssistant, device_ids: list[str]
+) -> tuple[dict[str, ZaparooData], dict[str, Any]]:
+    """
+    Look up the entry data of each device.
+
+    Returns the data of the devices found, and a failed response in the
+    shape _async_fan_out returns for each device that wasn't.
+    """
+    index = async_get_device_index(hass)
+    found: dict[str, ZaparooData] = {}
+    not_found: dict[str, Any] = {}
+    for device_id in device_ids:
         try:
-            response = await ws.send_jsonrpc("stop")
-        except Exception as err:
-            msg = f"Stop failed: {err}"
-            raise HomeAssistantError(msg) from err
+            found[device_id] = index.async_get_data(device_id)
+        except HomeAssistantError as err:
+            not_found[device_id] = {"success": False, "error": str(err)}
+    return found, not_found
+
+
+def _outbox_timeout(call: ServiceCall) -> float | None:
+    """Return how long a command may wait for its device to reconnect."""
+    if call.data["when_disconnected"] == WHEN_DISCONNECTED_FAIL:
+        return None
+    return call.data["queue_timeout"]
+
+
+async def _async_fan_out(  # noqa: PLR0913
+    hass: HomeAssistant,
+    device_ids: list[str],
+    method: str,
+    params: Any | None = None,
+    outbox_timeout: float | None = None,
+    device_params: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Send a command to every target device concurrently.
+
+    device_params, if given, holds each device's own params in place of
+    params.
+
+    Returns a per-device map of {"success": True, "result": ...} or
+    {"success": False, "error": "..."}; one failing device does not stop
+    the command reaching the others.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DEVICES)
+
+    async def _call(device_id: str) -> Any:
+        ws = _get_ws_for_device(hass, device_id)
+        async with semaphore:
+            try:
+                response = await ws.send_jsonrpc(
+                    method,
+                    device_params[device_id] if device_params else params,
+                    outbox_timeout=outbox_timeout,
+                )
+            except Exception as err:
+                raise HomeAssistantError(str(err)) from err
 
         if isinstance(response, dict) and "error" in response:
             raise HomeAssistantError(response["error"])
 
         result = response.get("result") if isinstance(response, dict) else None
         if result not in (None, {}, []):
-            msg = "Non-empty result from Zaparoo stop(): %s"
-            raise HomeAssistantError(msg, result)
+            msg = f"Non-empty result from Zaparoo {method}(): {result}"
+            raise HomeAssistantError(msg)
+        return result
+
+    return await _async_per_device(device_ids, _call)
 
 
-async def async_media_service(call: ServiceCall) -> Any:
-    """Call to return the currently running game."""
-    hass = call.hass
+async def _async_per_device(
+    device_ids: list[str], query: Callable[[str], Awaitable[Any]]
+) -> dict[str, Any]:
+    """
+    Run query for every device concurrently.
+
+    Returns a per-device map of {"success": True, "result": ...} or
+    {"success": False, "error": "..."}, so one failing device does not lose
+    the others' answers.
+    """
+    results = await asyncio.gather(
+        *(query(device_id) for device_id in device_ids), return_exceptions=True
+    )
+
+    responses: dict[str, Any] = {}
+    for device_id, result in zip(device_ids, results, strict=True):
+        if isinstance(result, Exception):
+            responses[device_id] = {"success": False, "error": str(result)}
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            responses[device_id] = {"success": True, "result": result}
+    return responses
+
+
+def _raise_for_errors(responses: dict[str, Any], action: str) -> None:
+    """Raise one error covering every device that failed."""
+    errors = [
+        f"{device_id}: {response['error']}"
+        for device_id, response in responses.items()
+        if not response["success"]
+    ]
+    if errors:
+        msg = f"{action} failed for {len(errors)} device(s): {'; '.join(errors)}"
+        raise HomeAssistantError(msg)
+
+
+async def async_media_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to return the currently running game.
+
+    Answered from push state when it is known to be current, otherwise by
+    querying the device. Returns a per-device map, as launch does.
+    """
     device_ids = _device_ids_from_target(call)
-    device_id = device_ids[0]
-    ws = _get_ws_for_device(hass, device_id)
+    index = async_get_device_index(call.hass)
+    max_age: float = call.data["max_age"]
+    force_refresh: bool = call.data["force_refresh"]
+
+    async def _media(device_id: str) -> Any:
+        data = index.async_get_data(device_id)
+        if not force_refresh and (snapshot := data.coordinator.media_snapshot(max_age)):
+            return snapshot
+        return await _async_fetch_media(data)
+
+    return await _async_per_device(device_ids, _media)
 
+
+async def _async_fetch_media(data: ZaparooData) -> Any:
+    """Query the device, sharing one request between concurrent callers."""
     try:
-        response = await ws.send_jsonrpc("media")
+        response = await data.client.send_jsonrpc("media", single_flight=True)
     except Exception as err:
         msg = f"Media query failed: {err}"
         raise HomeAssistantError(msg) from err
@@ -132,7 +477,146 @@ async def async_media_service(call: ServiceCall) -> Any:
     if isinstance(response, dict) and "error" in response:
         raise HomeAssistantError(response["error"])
 
-    return response.get("result") if isinstance(response, dict) else None
+    result = response.get("result") if isinstance(response, dict) else None
+    if isinstance(result, dict):
+        data.coordinator.apply_media_result(result)
+    return result
+
+
+async def async_search_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to search the media database, served from cache when possible.
+
+    Returns a per-device map, as launch does.
+    """
+    device_ids = _device_ids_from_target(call)
+    index = async_get_device_index(call.hass)
+    query: str = call.data["query"]
+    systems: list[str] = call.data.get("systems") or []
+    max_results: int | None = call.data.get("max_results")
+
+    async def _search(device_id: str) -> Any:
+        data = index.async_get_data(device_id)
+        return await _async_search(data, query, systems, max_results)
+
+    return await _async_per_device(device_ids, _search)
+
+
+async def _async_search(
+    data: ZaparooData, query: str, systems: list[str], max_results: int | None
+) -> Any:
+    """Search one device, or its local mirror while it is disconnected."""
+    if not data.coordinator.data.connected:
+        # The device is asleep or unreachable; answer from the local mirror.
+        await data.library.async_load()
+        if data.library.systems:
+            return await data.library.async_search(query, systems, max_results)
+
+    key = (query, tuple(sorted(systems)), max_results)
+    if (cached := data.search_cache.get(key)) is not None:
+        return cached
+
+    params: dict[str, Any] = {"query": query}
+    if systems:
+        params["systems"] = systems
+    if max_results is not None:
+        params["maxResults"] = max_results
+
+    try:
+        response = await data.client.send_jsonrpc(
+            "media.search", params, single_flight=True
+        )
+    except Exception as err:
+        msg = f"Media search failed: {err}"
+        raise HomeAssistantError(msg) from err
+
+    if isinstance(response, dict) and "error" in response:
+        raise HomeAssistantError(response["error"])
+
+    result = response.get("result") if isinstance(response, dict) else None
+    data.search_cache.set(key, result)
+    return result
+
+
+async def async_resolve_title_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to find the media best matching a title, best first.
+
+    Answered from the device's mirrored library, so it works while the
+    device is disconnected. Returns a per-device map, as launch does.
+    """
+    device_ids = _device_ids_from_target(call)
+    index = async_get_device_index(call.hass)
+    title: str = call.data["title"]
+    systems: list[str] = call.data.get("systems") or []
+    limit: int = call.data["limit"]
+
+    async def _matches(device_id: str) -> dict[str, Any]:
+        data = index.async_get_data(device_id)
+        matches = await _async_resolve_title(data, title, systems, limit)
+        return {"matches": [match.as_dict() for match in matches]}
+
+    return await _async_per_device(device_ids, _matches)
+
+
+async def async_history_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to return recent notifications, newest first, from memory.
+
+    One target returns its events; several return a map of device ID to
+    events.
+    """
+    device_ids = _device_ids_from_target(call)
+    index = async_get_device_index(call.hass)
+    methods: list[str] | None = call.data.get("method")
+    start = _as_timestamp(call.data.get("start"))
+    end = _as_timestamp(call.data.get("end"))
+    limit: int = call.data["limit"]
+
+    def _history(device_id: str) -> dict[str, Any]:
+        history = index.async_get_data(device_id).coordinator.history
+        records = history.query(methods, start, end, limit)
+        return {"events": [record.as_dict() for record in records]}
+
+    if len(device_ids) == 1:
+        return _history(device_ids[0])
+    return {device_id: _history(device_id) for device_id in device_ids}
+
+
+async def async_playtime_report_service(call: ServiceCall) -> ServiceResponse:
+    """
+    Call to return play time per day, system and title.
+
+    Covers the last week unless start/end are given, and includes the game
+    being played now. One target returns its report; several return a map of
+    device ID to report.
+    """
+    device_ids = _device_ids_from_target(call)
+    index = async_get_device_index(call.hass)
+    end: date = call.data.get("end") or dt_util.now().date()
+    start: date = call.data.get("start") or end - timedelta(
+        days=DEFAULT_PLAYTIME_DAYS - 1
+    )
+    if start > end:
+        msg = "start must not be after end"
+        raise HomeAssistantError(msg)
+    if (end - start).days >= PLAYTIME_RETENTION_DAYS:
+        msg = f"Play time is only kept for {PLAYTIME_RETENTION_DAYS} days"
+        raise HomeAssistantError(msg)
+
+    def _report(device_id: str) -> dict[str, Any]:
+        return index.async_get_data(device_id).playtime.report(start, end)
+
+    if len(device_ids) == 1:
+        return _report(device_ids[0])
+    return {device_id: _report(device_id) for device_id in device_ids}
+
+
+def _as_timestamp(value: Any) -> float | None:
+    """Convert a service datetime, naive meaning HA's time zone, to Unix time."""
+    if value is None:
+        return None
+    return dt_util.as_utc(value).timestamp()
 
 
 def async_register_services(hass: HomeAssistant) -> None:
@@ -142,46 +626,65 @@ def async_register_services(hass: HomeAssistant) -> None:
         SERVICE_LAUNCH,
         async_launch_service,
         schema=LAUNCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LAUNCH_SEQUENCE,
+        async_launch_sequence_service,
+        schema=LAUNCH_SEQUENCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_STOP,
         async_stop_service,
-        schema=NO_BODY_SCHEMA,
+        schema=STOP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_MEDIA,
         async_media_service,
-        schema=NO_BODY_SCHEMA,
+        schema=MEDIA_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        async_search_service,
+        schema=SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
-def _get_ws_for_device(hass: HomeAssistant, device_id: str) -> ZaparooWebSocket:
-    device_reg = dr.async_get(hass)
-    device = device_reg.async_get(device_id)
-
-    if device is None:
-        msg = f"Device not found: {device_id}"
-        raise HomeAssistantError(msg)
-
-    for entry_id in device.config_entries:
-        entry = hass.config_entries.async_get_entry(entry_id)
-
-        if entry is None or entry.domain != DOMAIN:
-            continue
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESOLVE_TITLE,
+        async_resolve_title_service,
+        schema=RESOLVE_TITLE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
-        zap_entry = cast("ZaparooDataConfigEntry", entry)
-        ws = zap_entry.runtime_data.client
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAYTIME_REPORT,
+        async_playtime_report_service,
+        schema=PLAYTIME_REPORT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
-        if ws is None:
-            msg = "Zaparoo is not connected"
-            raise HomeAssistantError(msg)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HISTORY,
+        async_history_service,
+        schema=HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
-        return ws
 
-    msg = "Zaparoo device not linked to config entry"
-    raise HomeAssistantError(msg)
+def _get_ws_for_device(hass: HomeAssistant, device_id: str) -> ZaparooWebSocket:
+    return async_get_device_index(hass).async_get_client(device_id)
@@ -0,0 +1,62 @@
+"""Persist device state across restarts."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PERSISTED_SLICES
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ZaparooCoordinator
+
+STORAGE_VERSION = 1
+# Coalesce bursts of state changes (a launch touches several slices) into one
+# write.
+SAVE_DELAY = 10
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}"
+
+
+class ZaparooStateStore:
+    """Saves the coordinator's device state so it can be shown on startup."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, coordinator: ZaparooCoordinator
+    ) -> None:
+        """Init the store for one config entry."""
+        self.coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+
+    async def async_restore(self) -> None:
+        """Load the last saved state into the coordinator, if there is one."""
+        if snapshot := await self._store.async_load():
+            self.coordinator.restore(snapshot)
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Save whenever persisted state changes; returns a stop callback."""
+        return self.coordinator.async_add_listener(
+            self._async_schedule_save, frozenset(PERSISTED_SLICES)
+        )
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self.coordinator.persisted_state, SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Write the current state now, replacing any delayed save."""
+        await self._store.async_save(self.coordinator.persisted_state())
+
+
+async def async_remove_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the saved state of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
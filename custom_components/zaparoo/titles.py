@@ -0,0 +1,217 @@
+"""Fuzzy media title lookup over a trigram index."""
+
+from __future__ import annotations
+
+import heapq
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+# Candidates come from the postings of the rarest trigrams of each query
+# word, so every word counts and lookups stay fast however common the other
+# trigrams are.
+TRIGRAMS_PER_WORD = 3
+# Trigrams in more titles than this are too common to draw candidates from;
+# counting their postings would cost more than the rest of the lookup. A word
+# with nothing rarer contributes an evenly spread sample of its rarest one.
+MAX_POSTING = 1024
+# Candidates scored exactly, best first by how many rare trigrams they share.
+MAX_CANDIDATES = 32
+
+# Region and dump tags such as "(USA)" or "[!]" don't help tell titles apart.
+_TAGS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """Fold case, accents, tags and punctuation out of a title."""
+    title = unicodedata.normalize("NFKD", _TAGS.sub(" ", title))
+    title = "".join(c for c in title if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", title.casefold()).strip()
+
+
+def trigrams(normalized: str) -> set[str]:
+    """Return the trigrams of a normalized title, padded at both ends."""
+    padded = f"  {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(slots=True, frozen=True)
+class TitleMatch:
+    """A resolved title."""
+
+    system_id: str
+    name: str
+    path: str
+    score: float
+
+    @property
+    def zapscript(self) -> str:
+        """ZapScript that launches this title."""
+        return f"**launch.title:{self.system_id}/{self.name}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the match for a service response."""
+        return {
+            "system_id": self.system_id,
+            "name": self.name,
+            "path": self.path,
+            "score": self.score,
+            "zapscript": self.zapscript,
+        }
+
+
+class TitleIndex:
+    """
+    Immutable trigram index over a device's media titles.
+
+    Titles are stored in parallel arrays and each trigram maps to a compact
+    array of title numbers. A lookup takes candidates from the postings of
+    the query's rarest trigrams and scores only the best of those exactly,
+    by the Dice coefficient of the two trigram sets. Postings of common
+    trigrams are sampled rather than counted in full, which bounds the cost
+    of a lookup however large the library. Build it with build(), off the
+    event loop for large libraries.
+    """
+
+    __slots__ = (
+        "_exact",
+        "_names",
+        "_normalized",
+        "_paths",
+        "_postings",
+        "_sizes",
+        "_systems",
+    )
+
+    def __init__(self) -> None:
+        """Init an empty index."""
+        self._systems: list[str] = []
+        self._names: list[str] = []
+        self._normalized: list[str] = []
+        self._paths: list[str] = []
+        self._sizes = array("H")
+        self._postings: dict[str, array[int]] = {}
+        self._exact: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed titles."""
+        return len(self._names)
+
+    @classmethod
+    def build(cls, entries: Iterable[tuple[str, str, str]]) -> TitleIndex:
+        """Index (system ID, name, path) entries."""
+        index = cls()
+        postings: dict[str, array[int]] = {}
+        for number, (system_id, name, path) in enumerate(entries):
+            normalized = normalize_title(name)
+            grams = trigrams(normalized)
+            index._systems.append(system_id)
+            index._names.append(name)
+            index._normalized.append(normalized)
+            index._paths.append(path)
+            index._sizes.append(min(len(grams), 0xFFFF))
+            index._exact.setdefault(normalized, []).append(number)
+            for gram in grams:
+                if (posting := postings.get(gram)) is None:
+                    posting = postings[gram] = array("I")
+                posting.append(number)
+        index._postings = postings
+        return index
+
+    @staticmethod
+    def _candidates(hits: Counter[int]) -> list[int]:
+        """Return the titles sharing the most rare trigrams with the query."""
+        if not hits:
+            return []
+        # Cheaper than most_common() over every hit: keep only the near-best.
+        cutoff = max(hits.values()) - 1
+        candidates = [number for number, count in hits.items() if count >= cutoff]
+        if len(candidates) > MAX_CANDIDATES:
+            candidates = heapq.nlargest(
+                MAX_CANDIDATES, candidates, key=hits.__getitem__
+            )
+        return candidates
+
+    def _rare_postings(self, normalized: str) -> list[Sequence[int]]:
+        """Return the postings to draw a query's candidates from."""
+        rare: dict[str, Sequence[int]] = {}
+        for word in normalized.split():
+            word_postings = sorted(
+                (
+                    (len(posting), gram, posting)
+                    for gram in trigrams(word)
+                    if (posting := self._postings.get(gram)) is not None
+                ),
+                key=itemgetter(0),
+            )
+            if not word_postings:
+                continue
+            size, gram, posting = word_postings[0]
+            if size > MAX_POSTING:
+                # Every trigram of the word is common; sample the rarest.
+                rare[gram] = posting[:: size // MAX_POSTING + 1]
+                continue
+            rare.update(
+                (gram, posting)
+                for size, gram, posting in word_postings[:TRIGRAMS_PER_WORD]
+                if size <= MAX_POSTING
+            )
+        return list(rare.values())
+
+    def search(
+        self,
+        query: str,
+        systems: Iterable[str] | None = None,
+        limit: int = 5,
+        min_score: float = 0.0,
+    ) -> list[TitleMatch]:
+        """Return up to limit titles most like query, best first."""
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+        allowed = set(systems) if systems else None
+        query_grams = trigrams(normalized)
+
+        # An exact match after normalizing always ranks first.
+        scores: dict[int, float] = dict.fromkeys(self._exact.get(normalized, ()), 1.0)
+
+        hits: Counter[int] = Counter()
+        for posting in self._rare_postings(normalized):
+            hits.update(posting)
+        if allowed is not None:
+            hits = Counter(
+                {n: c for n, c in hits.items() if self._systems[n] in allowed}
+            )
+
+        for number in self._candidates(hits):
+            if number not in scores:
+                name_grams = trigrams(self._normalized[number])
+                shared = len(query_grams & name_grams)
+                scores[number] = 2 * shared / (len(query_grams) + self._sizes[number])
+
+        best = heapq.nlargest(
+            limit,
+            (
+                (score, number)
+                for number, score in scores.items()
+                if score >= min_score
+                and (allowed is None or self._systems[number] in allowed)
+            ),
+        )
+        return [
+            TitleMatch(
+                self._systems[number],
+                self._names[number],
+                self._paths[number],
+                round(score, 4),
+            )
+            for score, number in best
+        ]
@@ -6,36 +6,112 @@ import asyncio
 import contextlib
 import json
 import logging
+import re
+import time
 import uuid
+from collections import OrderedDict, deque
 from typing import TYPE_CHECKING, Any
 
 import websockets
 from homeassistant.exceptions import HomeAssistantError
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+from .const import (
+    DEFAULT_RPC_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_MAX_MISSES,
+    OUTBOX_SIZE,
+    RPC_MAX_IN_FLIGHT,
+    RPC_MAX_QUEUED,
+    RPC_RTO_FACTOR,
+    RPC_TIMEOUTS,
+    WS_MAX_MESSAGE_SIZE,
+)
+from .metrics import ClientMetrics
+from .reconnect import STABLE_CONNECTION_TIME, ReconnectBackoff
+from .rtt import RTO_MAX, RttEstimator
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from .coordinator import ZaparooCoordinator
+    from .reconnect import ConnectSupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
 API_PATH = "/api/v0.1"
 
+# How many timed-out or cancelled request IDs to remember, so a response that
+# arrives after its caller gave up is counted as late rather than orphaned.
+ABANDONED_ID_HISTORY = 256
+
+# The start of a notification frame as Zaparoo Core writes it, method first,
+# so the method can be read without decoding the whole frame.
+_NOTIFICATION_METHOD = re.compile(
+    r'\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"method"\s*:\s*"([^"\\]+)"'
+)
+
 
 class ZaparooWebSocket:
     """Manage a persistent WebSocket connection to a Zaparoo device."""
 
-    def __init__(self, host: str, port: int, coordinator: ZaparooCoordinator) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        port: int,
+        coordinator: ZaparooCoordinator,
+        supervisor: ConnectSupervisor | None = None,
+        max_in_flight: int = RPC_MAX_IN_FLIGHT,
+        max_queued: int = RPC_MAX_QUEUED,
+    ) -> None:
         """Init the web socket."""
         self.host = host
         self.port = port
         self.coordinator = coordinator
+        self._event_methods = coordinator.event_methods
+        self._supervisor = supervisor
+        self._backoff = ReconnectBackoff()
+        self._wake = asyncio.Event()
 
         self._ws = None  # intentionally untyped (HA style)
         self._task: asyncio.Task | None = None
+        # Tasks that live as long as one connection: resync and keepalive
+        self._session_tasks: list[asyncio.Task] = []
         self._stop = False
 
         # Pending JSON-RPC requests: id -> Future
         self._pending: dict[str, asyncio.Future] = {}
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._max_queued = max_queued
+        self._queued = 0
+        self._abandoned: OrderedDict[str, None] = OrderedDict()
+        # Requests waiting out a disconnect, released in order on reconnect
+        self._outbox: deque[asyncio.Future[None]] = deque()
+        # (method, canonical params) -> request shared by concurrent callers
+        self._shared: dict[tuple[str, str], asyncio.Task[Any]] = {}
+        self.metrics = ClientMetrics()
+        self.rtt = RttEstimator()
+
+    @property
+    def pending_requests(self) -> int:
+        """Requests sent and awaiting a response."""
+        return len(self._pending)
+
+    @property
+    def queued_requests(self) -> int:
+        """Requests waiting for an in-flight slot."""
+        return self._queued
+
+    @property
+    def outbox_requests(self) -> int:
+        """Requests waiting for the connection to come back."""
+        return len(self._outbox)
 
     async def start(self) -> None:
         """Start the websocket connection loop."""
@@ -56,23 +132,40 @@ class ZaparooWebSocket:
                 await self._task
 
         self._fail_pending(HomeAssistantError("WebSocket stopped"))
+        self._fail_outbox(HomeAssistantError("WebSocket stopped"))
 
     async def _run(self) -> None:
         """Loop reconnect."""
         url = f"ws://{self.host}:{self.port}{API_PATH}"
         while not self._stop:
+            connected_at: float | None = None
             try:
                 _LOGGER.debug("Connecting to Zaparoo WS: %s", url)
-                async with websockets.connect(
-                    url,
-                    ping_interval=15,
-                    ping_timeout=10,
-                ) as ws:
+                async with self._connect_slot():
+                    # Keepalive is handled by _keepalive, which measures RTT.
+                    ws = await websockets.connect(
+                        url,
+                        ping_interval=None,
+                        ping_timeout=None,
+                        max_size=WS_MAX_MESSAGE_SIZE,
+                    )
+                connected_at = time.monotonic()
+                self.metrics.connects += 1
+                try:
                     self._ws = ws
                     self.coordinator.connected()
                     _LOGGER.info("Zaparoo WS connected")
+                    self._flush_outbox()
 
+                    # Responses arrive through _listen, so resync alongside it.
+                    self._session_tasks = [
+                        asyncio.create_task(self._resync()),
+                        asyncio.create_task(self._keepalive(ws)),
+                    ]
                     await self._listen()
+                finally:
+                    await self._cancel_session_tasks()
+                    await ws.close()
             except (ConnectionClosedOK, ConnectionClosedError):
                 _LOGGER.debug("Zaparoo WS closed")
             except asyncio.CancelledError:
@@ -81,15 +174,127 @@ class ZaparooWebSocket:
             except Exception as err:  # noqa: BLE001
                 _LOGGER.debug("Zaparoo WS error: %s", err)
 
+            if connected_at is None:
+                self.metrics.connect_failures += 1
+            else:
+                self.metrics.disconnects += 1
+
             self._ws = None
             self.coordinator.disconnected()
             self._fail_pending(RuntimeError("WebSocket disconnected"))
 
+            if (
+                connected_at is not None
+                and time.monotonic() - connected_at >= STABLE_CONNECTION_TIME
+            ):
+                self._backoff.reset()
+
             if not self._stop:
-                await asyncio.sleep(5)
+                await self._wait_reconnect(self._backoff.next_delay())
 
         _LOGGER.debug("Zaparoo WS loop stopped")
 
+    async def _resync(self) -> None:
+        """
+        Reconcile state with the device after connecting.
+
+        Anything pushed while disconnected was missed, and state restored from
+        a previous run may be out of date, so every state query is sent at once
+        and the answers applied together in a single coordinator update.
+        """
+        methods = self.coordinator.resync_methods
+        responses = await asyncio.gather(
+            *(self.send_jsonrpc(method, single_flight=True) for method in methods),
+            return_exceptions=True,
+        )
+
+        results: dict[str, Any] = {}
+        for method, response in zip(methods, responses, strict=True):
+            if isinstance(response, BaseException):
+                if isinstance(response, asyncio.CancelledError):
+                    raise response
+                _LOGGER.debug("Zaparoo %s resync failed: %s", method, response)
+            elif isinstance(response, dict) and "error" in response:
+                _LOGGER.debug("Zaparoo %s resync failed: %s", method, response["error"])
+            else:
+                results[method] = (
+                    response.get("result") if isinstance(response, dict) else None
+                )
+        self.coordinator.apply_resync(results)
+
+    async def _keepalive(self, ws: Any) -> None:
+        """
+        Ping the device to sample RTT and notice a dead link.
+
+        A ping unanswered within the current RTO is retried straight away with
+        twice the timeout (up to RTO_MAX). Once KEEPALIVE_MAX_MISSES pings in a
+        row have gone unanswered the link is gone: the connection is aborted
+        so pending requests fail and reconnecting starts within seconds,
+        rather than after TCP gives up.
+        """
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            timeout = self.rtt.rto
+            for _ in range(KEEPALIVE_MAX_MISSES):
+                sent = time.monotonic()
+                try:
+                    async with asyncio.timeout(timeout):
+                        pong = await ws.ping()
+                        await pong
+                except TimeoutError:
+                    timeout = min(timeout * 2, RTO_MAX)
+                    continue
+                except websockets.ConnectionClosed:
+                    return
+                self.rtt.observe(time.monotonic() - sent)
+                break
+            else:
+                self.metrics.keepalive_failures += 1
+                _LOGGER.info(
+                    "Zaparoo device did not answer %d pings in a row, reconnecting",
+                    KEEPALIVE_MAX_MISSES,
+                )
+                ws.transport.abort()
+                return
+
+    async def _cancel_session_tasks(self) -> None:
+        tasks, self._session_tasks = self._session_tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _rpc_timeout(self, method: str) -> float:
+        """
+        Return the timeout for a method, stretched to suit a slow link.
+
+        A dead link is caught by the keepalive, so the timeout only has to
+        allow for a slow one: at least RPC_RTO_FACTOR times the current RTO.
+        """
+        timeout = RPC_TIMEOUTS.get(method, DEFAULT_RPC_TIMEOUT)
+        if self.rtt.srtt is None:
+            return timeout
+        return max(timeout, RPC_RTO_FACTOR * self.rtt.rto)
+
+    def _connect_slot(self) -> contextlib.AbstractAsyncContextManager[None]:
+        """Return the shared supervisor slot a connect attempt must hold."""
+        if self._supervisor is None:
+            return contextlib.nullcontext()
+        return self._supervisor.slot()
+
+    async def _wait_reconnect(self, delay: float) -> None:
+        """Sleep before reconnecting, unless a reconnect is requested sooner."""
+        _LOGGER.debug("Reconnecting to Zaparoo WS in %.1fs", delay)
+        self._wake.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wake.wait(), delay)
+
+    def request_reconnect(self) -> None:
+        """Skip the remaining backoff delay and reconnect now."""
+        if self._ws is None:
+            self._wake.set()
+
     async def _listen(self) -> None:
         """Listen for incoming websocket messages."""
         ws = self._ws
@@ -108,31 +313,131 @@ class ZaparooWebSocket:
 
     def _handle_message(self, message: websockets.Data) -> None:
         """Websocket message handling."""
+        self.metrics.record_message()
+        # Drop unwanted notifications before paying for the JSON decode.
+        if isinstance(message, str) and (match := _NOTIFICATION_METHOD.match(message)):
+            method = match[1]
+            if method not in self._event_methods:
+                self._ignore_notification(method)
+                return
+
         try:
-            data = json.loads(message)
+            data = json_loads(message)
+            if not isinstance(data, dict):
+                # Valid JSON, but not a JSON-RPC object (a batch or a bare value).
+                self.metrics.notifications += 1
+                self.metrics.notifications_ignored += 1
+                _LOGGER.debug("Ignoring non-object Zaparoo message: %.200s", message)
+                return
 
             # JSON-RPC response
-            if "id" in data:
-                fut = self._pending.get(data["id"])
-                _LOGGER.info(message)
-                if fut and not fut.done():
+            rpc_id = data.get("id")
+            if rpc_id is not None:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Zaparoo RPC response: %s", message)
+                fut = self._pending.get(rpc_id)
+                if fut is None:
+                    self._count_unmatched(rpc_id)
+                elif not fut.done():
                     fut.set_result(data)
 
             # Server-side event
-            if "method" in data:
-                self.coordinator.handle_ws_event(
-                    data["method"],
-                    data.get("params"),
-                )
+            method = data.get("method")
+            if method is None:
+                return
+            if method not in self._event_methods:
+                self._ignore_notification(method)
+                return
+            self.metrics.notifications += 1
+            self.coordinator.handle_ws_event(method, data.get("params"))
         except Exception:
             _LOGGER.exception("Failed to process Zaparoo WS message")
 
-    async def send_jsonrpc(self, method: str, params: Any | None = None) -> Any:
-        """Send a JSON-RPC request and wait for its response."""
+    def _ignore_notification(self, method: str) -> None:
+        self.metrics.notifications += 1
+        self.metrics.notifications_ignored += 1
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Ignoring Zaparoo notification: %s", method)
+
+    def set_event_families(self, families: Iterable[str]) -> None:
+        """Only process notifications of these families, dropping the rest."""
+        self.coordinator.set_event_families(families)
+        self._event_methods = self.coordinator.event_methods
+
+    async def send_jsonrpc(
+        self,
+        method: str,
+        params: Any | None = None,
+        *,
+        rpc_timeout: float | None = None,
+        single_flight: bool = False,
+        outbox_timeout: float | None = None,
+    ) -> Any:
+        """
+        Send a JSON-RPC request and wait for its response.
+
+        At most max_in_flight requests are outstanding at once; later ones wait
+        in FIFO order. The timeout (per method unless given) covers both the
+        wait for a slot and the response.
+
+        With single_flight, a call to an idempotent method joins an identical
+        request already in flight and shares its response or error, which
+        callers must not modify.
+
+        With outbox_timeout, a request made while disconnected waits up to that
+        many seconds in the outbox for the connection to come back instead of
+        failing straight away. So does one whose connection drops while it
+        waits for a slot. Requests already sent when the connection drops
+        still fail, since the device may have acted on them.
+        """
+        if single_flight and method in IDEMPOTENT_METHODS:
+            return await self._send_shared(method, params, rpc_timeout, outbox_timeout)
+        return await self._send_jsonrpc(method, params, rpc_timeout, outbox_timeout)
+
+    async def _send_shared(
+        self,
+        method: str,
+        params: Any | None,
+        rpc_timeout: float | None,
+        outbox_timeout: float | None,
+    ) -> Any:
+        key = (method, json.dumps(params, sort_keys=True, separators=(",", ":")))
+        if (task := self._shared.get(key)) is not None:
+            self.metrics.rpc_shared += 1
+        else:
+            task = asyncio.create_task(
+                self._send_jsonrpc(method, params, rpc_timeout, outbox_timeout)
+            )
+            self._shared[key] = task
+
+            def _done(task: asyncio.Task[Any]) -> None:
+                if self._shared.get(key) is task:
+                    del self._shared[key]
+                # Every caller may have given up; mark the error as retrieved.
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(_done)
+
+        # Shielded so one caller giving up doesn't cancel the others' request.
+        return await asyncio.shield(task)
+
+    async def _send_jsonrpc(
+        self,
+        method: str,
+        params: Any | None,
+        rpc_timeout: float | None,
+        outbox_timeout: float | None,
+    ) -> Any:
         if self._ws is None:
-            msg = "Zaparoo WebSocket is not connected"
+            await self._wait_connected(method, outbox_timeout)
+
+        if self._queued >= self._max_queued:
+            msg = "Too many Zaparoo requests queued"
             raise HomeAssistantError(msg)
 
+        timeout = rpc_timeout or self._rpc_timeout(method)
+
         rpc_id = str(uuid.uuid4())
 
         payload: dict[str, Any] = {
@@ -144,16 +449,110 @@ class ZaparooWebSocket:
         if params is not None:
             payload["params"] = params
 
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
-        self._pending[rpc_id] = future
+        metrics = self.metrics
+        metrics.rpc_requests += 1
+        started = time.monotonic()
+        self._queued += 1
+        queued = True
+        try:
+            while True:
+                async with asyncio.timeout(timeout), self._in_flight:
+                    if queued:
+                        self._queued -= 1
+                        queued = False
+                    if self._ws is not None or not outbox_timeout:
+                        response = await self._send_and_wait(rpc_id, payload)
+                        break
+                # Disconnected while waiting for the slot; give it back and
+                # wait in the outbox like a command made while disconnected.
+                await self._wait_connected(method, outbox_timeout)
+        except TimeoutError as err:
+            metrics.rpc_timeouts += 1
+            msg = f"Zaparoo {method} timed out after {timeout:g}s"
+            raise HomeAssistantError(msg) from err
+        except Exception:
+            metrics.rpc_failures += 1
+            raise
+        else:
+            metrics.rpc_latency.observe(time.monotonic() - started)
+            return response
+        finally:
+            if queued:
+                self._queued -= 1
+
+    async def _wait_connected(self, method: str, outbox_timeout: float | None) -> None:
+        """Wait in the outbox for a reconnect, or fail if there is no outbox."""
+        # Something needs the device; retry now rather than after backoff.
+        self.request_reconnect()
+        if not outbox_timeout:
+            msg = "Zaparoo WebSocket is not connected"
+            raise HomeAssistantError(msg)
+        await self._wait_in_outbox(method, outbox_timeout)
+
+    async def _wait_in_outbox(self, method: str, outbox_timeout: float) -> None:
+        """Wait for the connection to come back, up to outbox_timeout seconds."""
+        if len(self._outbox) >= OUTBOX_SIZE:
+            msg = f"Zaparoo {method} rejected: too many requests waiting to reconnect"
+            raise HomeAssistantError(msg)
 
-        await self._ws.send(json.dumps(payload))
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._outbox.append(waiter)
+        self.metrics.outbox_queued += 1
+        try:
+            async with asyncio.timeout(outbox_timeout):
+                await waiter
+        except TimeoutError as err:
+            self.metrics.outbox_expired += 1
+            msg = (
+                f"Zaparoo {method} expired: device did not reconnect "
+                f"within {outbox_timeout:g}s"
+            )
+            raise HomeAssistantError(msg) from err
+        finally:
+            with contextlib.suppress(ValueError):
+                self._outbox.remove(waiter)
+
+    def _flush_outbox(self) -> None:
+        """Release requests waiting to reconnect, in the order they were made."""
+        while self._outbox:
+            waiter = self._outbox.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _fail_outbox(self, exc: Exception) -> None:
+        while self._outbox:
+            waiter = self._outbox.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
+    async def _send_and_wait(self, rpc_id: str, payload: dict[str, Any]) -> Any:
+        """Send one request while holding an in-flight slot."""
+        ws = self._ws
+        if ws is None:
+            msg = "Zaparoo WebSocket is not connected"
+            raise HomeAssistantError(msg)
 
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rpc_id] = future
         try:
-            return await asyncio.wait_for(future, timeout=10)
+            await ws.send(json.dumps(payload))
+            return await future
         finally:
-            self._pending.pop(rpc_id, None)
+            # Still pending means the caller timed out or was cancelled.
+            pending = self._pending.pop(rpc_id, None) is not None
+            if pending and (future.cancelled() or not future.done()):
+                self._abandoned[rpc_id] = None
+                if len(self._abandoned) > ABANDONED_ID_HISTORY:
+                    self._abandoned.popitem(last=False)
+
+    def _count_unmatched(self, rpc_id: Any) -> None:
+        """Account for a response nobody is waiting for."""
+        if self._abandoned.pop(rpc_id, False) is None:
+            self.metrics.late_responses += 1
+            _LOGGER.debug("Late Zaparoo response for abandoned request %s", rpc_id)
+        else:
+            self.metrics.orphaned_responses += 1
+            _LOGGER.debug("Orphaned Zaparoo response with id %s", rpc_id)
 
     def _fail_pending(self, exc: Exception) -> None:
         """Fail all pending RPC futures."""